@@ -0,0 +1,115 @@
+#!/usr/bin/env node
+/* Headless render benchmark for microgreens-card.
+
+   Run from the repository root (jsdom is only needed for this script):
+
+       npm install --no-save jsdom
+       node benchmarks/bench_card.js [--plots 50 500 2000] [--rounds 20]
+
+   Drives the card through its hass.states path (no websocket connection)
+   and prints one JSON document so results can be diffed between releases:
+
+     first_render_ms    building the grid from scratch
+     unrelated_ms       a state change elsewhere in Home Assistant
+     one_plot_ms        one plot sensor changed
+*/
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const { performance } = require("perf_hooks");
+const { JSDOM } = require("jsdom");
+
+const CARD = path.join(__dirname, "..", "custom_components", "ha-microgreens", "www", "microgreens-card.js");
+
+function parseArgs(argv) {
+  const args = { plots: [50, 500, 2000], rounds: 20 };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === "--plots") {
+      args.plots = [];
+      while (i + 1 < argv.length && !argv[i + 1].startsWith("--")) args.plots.push(Number(argv[++i]));
+    } else if (argv[i] === "--rounds") {
+      args.rounds = Number(argv[++i]);
+    }
+  }
+  return args;
+}
+
+function plotState(id, stamp) {
+  return {
+    entity_id: `sensor.microgreens_plot_${id.toLowerCase()}`,
+    state: "covered",
+    last_updated: stamp,
+    attributes: {
+      plot_id: id, sticker: id, plant_id: "rukola", plant_name: "Rukola",
+      days_since_planting: 2, cover_end: "2025-10-01", harvest_date: "2025-10-09",
+      next_watering_due: "2025-09-27",
+    },
+  };
+}
+
+function makeHass(n) {
+  const plots = [];
+  const states = {};
+  for (let i = 0; i < n; i++) {
+    const id = `P${i}`;
+    plots.push({ id, label: `Plot ${id}` });
+    const s = plotState(id, "t0");
+    states[s.entity_id] = s;
+  }
+  states["sensor.microgreens_meta"] = {
+    entity_id: "sensor.microgreens_meta", state: "ok", last_updated: "t0",
+    attributes: { revision: 1, plots, profiles: [{ id: "rukola", name: "Rukola", cover_days: 3, uncover_days: 8, water: 1 }] },
+  };
+  return { states, connection: null, callService: async () => {} };
+}
+
+function minOf(rounds, fn) {
+  let best = Infinity;
+  for (let r = 0; r < rounds; r++) {
+    const t0 = performance.now();
+    fn(r);
+    best = Math.min(best, performance.now() - t0);
+  }
+  return Number(best.toFixed(3));
+}
+
+function bench(n, rounds) {
+  const src = fs.readFileSync(CARD, "utf8");
+  const base = makeHass(n);
+  const firstRender = minOf(Math.min(rounds, 5), () => {
+    const dom = new JSDOM("<!doctype html><body></body>", { runScripts: "outside-only" });
+    dom.window.eval(src);
+    const card = dom.window.document.createElement("microgreens-card");
+    card.setConfig({});
+    dom.window.document.body.appendChild(card);
+    card.hass = base;
+  });
+
+  const dom = new JSDOM("<!doctype html><body></body>", { runScripts: "outside-only" });
+  dom.window.eval(src);
+  const card = dom.window.document.createElement("microgreens-card");
+  card.setConfig({});
+  dom.window.document.body.appendChild(card);
+  card.hass = base;
+
+  const unrelated = minOf(rounds, (r) => {
+    card.hass = { ...base, states: { ...base.states, "light.kitchen": { state: r % 2 ? "on" : "off", last_updated: `l${r}` } } };
+  });
+  const target = plotState("P0", "t0").entity_id;
+  const onePlot = minOf(rounds, (r) => {
+    const s = plotState("P0", `t${r + 1}`);
+    s.state = r % 2 ? "uncovered" : "mature";
+    card.hass = { ...base, states: { ...base.states, [target]: s } };
+  });
+  return { first_render_ms: firstRender, unrelated_ms: unrelated, one_plot_ms: onePlot };
+}
+
+function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const results = {};
+  for (const n of args.plots) results[String(n)] = bench(n, args.rounds);
+  process.stdout.write(JSON.stringify({ benchmark: "card", results }, null, 2) + "\n");
+}
+
+main();
@@ -0,0 +1,104 @@
+"""Reload harness: set the entry up, reload it N times, check nothing piles up.
+
+Needs Home Assistant's test helpers (run from the repository root):
+
+    pip install pytest-homeassistant-custom-component
+    python benchmarks/bench_lifecycle.py [--reloads 50] [--max-growth-kb 256]
+
+After one warm-up reload it samples, on every reload: live Runtime objects,
+registered microgreens services, bus listeners, our dispatcher
+connections, pending loop timers, tracked lifecycle registrations and
+traced memory. Prints one JSON document and exits non-zero when any count
+differs from the warm-up sample or memory grows past the limit.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import importlib
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant import loader  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+mg = importlib.import_module("custom_components.ha-microgreens")
+
+
+def sample(hass) -> dict:
+    gc.collect()
+    runtimes = hass.data.get(mg.DOMAIN, {})
+    return {
+        "runtimes_alive": sum(isinstance(o, mg.Runtime) for o in gc.get_objects()),
+        "services": len(hass.services.async_services().get(mg.DOMAIN, {})),
+        "bus_listeners": sum(hass.bus.async_listeners().values()),
+        "dispatcher_connections": sum(
+            len(targets) for signal, targets in hass.data.get("dispatcher", {}).items()
+            if str(signal).startswith(mg.DOMAIN)
+        ),
+        "loop_timers": sum(not h.cancelled() for h in hass.loop._scheduled),
+        "lifecycle_registrations": sum(len(rt.lifecycle) for rt in runtimes.values()),
+        "memory_bytes": tracemalloc.get_traced_memory()[0],
+    }
+
+
+async def run(reloads: int, max_growth_kb: int) -> dict:
+    async with async_test_home_assistant() as hass:
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)  # allow custom_components/
+        entry = MockConfigEntry(domain=mg.DOMAIN, title="Microgreens", data={}, options={"save_delay": 0})
+        entry.add_to_hass(hass)
+        assert await async_setup_component(hass, mg.DOMAIN, {})
+        await hass.async_block_till_done()
+
+        tracemalloc.start()
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        baseline = sample(hass)
+        last = baseline
+        for _ in range(reloads):
+            assert await hass.config_entries.async_reload(entry.entry_id)
+            await hass.async_block_till_done()
+            last = sample(hass)
+        tracemalloc.stop()
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        unloaded = sample(hass)
+        await hass.async_stop(force=True)
+
+    growth = last["memory_bytes"] - baseline["memory_bytes"]
+    drift = {k: (baseline[k], last[k]) for k in baseline if k != "memory_bytes" and baseline[k] != last[k]}
+    return {
+        "benchmark": "lifecycle",
+        "reloads": reloads,
+        "baseline": baseline,
+        "final": last,
+        "after_unload": unloaded,
+        "memory_growth_bytes": growth,
+        "count_drift": drift,
+        "ok": not drift and growth <= max_growth_kb * 1024 and unloaded["lifecycle_registrations"] == 0,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--reloads", type=int, default=50)
+    ap.add_argument("--max-growth-kb", type=int, default=256)
+    args = ap.parse_args()
+    result = asyncio.run(run(args.reloads, args.max_growth_kb))
+    json.dump(result, sys.stdout, indent=2)
+    print()
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
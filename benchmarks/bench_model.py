@@ -0,0 +1,130 @@
+"""Micro-benchmarks for the in-memory model.
+
+Run from the repository root with Home Assistant installed:
+
+    python benchmarks/bench_model.py [--plots 1000] [--rounds 20]
+
+Prints one JSON document so results can be diffed between releases.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import sys
+import timeit
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+mg = importlib.import_module("custom_components.ha-microgreens")
+mg_sensor = importlib.import_module("custom_components.ha-microgreens.sensor")
+
+
+def make_raw(n: int) -> dict:
+    start = date.today() - timedelta(days=5)
+    deps = []
+    for i in range(n):
+        sd = start + timedelta(days=i % 10)
+        deps.append({
+            "plot_id": f"P{i}", "sticker": f"P{i}", "plant_id": "rukola", "plant_name": "Rukola",
+            "start_date": sd.isoformat(), "cover_end": (sd + timedelta(days=3)).isoformat(),
+            "harvest_date": (sd + timedelta(days=11)).isoformat(), "watering_every_days": 1,
+            "next_watering_due": (sd + timedelta(days=1)).isoformat(), "notes": "",
+        })
+    return {
+        "plots": [{"id": f"P{i}", "label": f"Plot P{i}"} for i in range(n)],
+        "profiles": [{"id": "rukola", "name": "Rukola", "cover_days": 3, "uncover_days": 8}],
+        "deployments": deps,
+    }
+
+
+@dataclass
+class _LegacyDeployment:
+    """The pre-slots model: plain dataclass, serialised with asdict()."""
+    plot_id: str
+    sticker: str
+    plant_id: str
+    plant_name: str
+    start_date: str
+    cover_end: str
+    harvest_date: str
+    watering_every_days: int
+    next_watering_due: str
+    notes: str = ""
+
+
+def _legacy_refresh(dep: dict) -> tuple:
+    """The pre-parsed-dates refresh path: ISO strings parsed on every read."""
+    today = date.today()
+    ce = date.fromisoformat(dep["cover_end"])
+    hv = date.fromisoformat(dep["harvest_date"])
+    state = "covered" if today < ce else "uncovered" if today < hv else "mature"
+    days = max(0, (date.today() - date.fromisoformat(dep["start_date"])).days)
+    attrs = {**dep, "days_since_planting": days}
+    return state, attrs
+
+
+def bench_refresh(raw: dict, rounds: int) -> dict:
+    data = mg.MicrogreensData.from_dict(raw)
+    rt = SimpleNamespace(data=data, entry=SimpleNamespace(entry_id="bench"), entity_prefix="Microgreens")
+    sensors = [mg_sensor.MicrogreensPlotSensor(rt, pid) for pid in data.plots]
+
+    def current():
+        # the properties serve a cached snapshot; time what a refresh rebuilds
+        for s in sensors:
+            s._compute()
+
+    def legacy():
+        for d in raw["deployments"]:
+            _legacy_refresh(d)
+
+    return {
+        "refresh_s": min(timeit.repeat(current, number=1, repeat=rounds)),
+        "legacy_iso_refresh_s": min(timeit.repeat(legacy, number=1, repeat=rounds)),
+    }
+
+
+def _allocated(build) -> tuple[int, object]:
+    tracemalloc.start()
+    objs = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, objs
+
+
+def bench_codec(raw: dict, rounds: int) -> dict:
+    rows = raw["deployments"]
+    # both sides decode their own copy of the JSON, so strings the legacy
+    # dataclass keeps by reference are counted as well as the ones from_dict builds
+    text = json.dumps(rows)
+    mem, deps = _allocated(lambda: [mg.Deployment.from_dict(r) for r in json.loads(text)])
+    legacy_mem, legacy = _allocated(lambda: [_LegacyDeployment(**r) for r in json.loads(text)])
+    return {
+        "memory_bytes": mem,
+        "legacy_memory_bytes": legacy_mem,
+        "from_dict_s": min(timeit.repeat(lambda: [mg.Deployment.from_dict(r) for r in rows], number=1, repeat=rounds)),
+        "legacy_from_dict_s": min(timeit.repeat(lambda: [_LegacyDeployment(**r) for r in rows], number=1, repeat=rounds)),
+        "to_dict_s": min(timeit.repeat(lambda: [d.to_dict() for d in deps], number=1, repeat=rounds)),
+        "legacy_asdict_s": min(timeit.repeat(lambda: [asdict(d) for d in legacy], number=1, repeat=rounds)),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--plots", type=int, nargs="*", default=[10, 1000, 10000])
+    ap.add_argument("--rounds", type=int, default=10)
+    args = ap.parse_args()
+    results = {}
+    for n in args.plots:
+        raw = make_raw(n)
+        results[str(n)] = {**bench_refresh(raw, args.rounds), **bench_codec(raw, args.rounds)}
+    json.dump({"benchmark": "model", "results": results}, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
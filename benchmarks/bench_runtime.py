@@ -0,0 +1,220 @@
+"""Synthetic-farm benchmarks for the runtime, the entities and the store.
+
+Needs Home Assistant's test helpers (run from the repository root):
+
+    pip install pytest-homeassistant-custom-component
+    python benchmarks/bench_runtime.py [--plots 10 1000 10000] [--rounds 5]
+
+Every farm size gets a fresh Home Assistant instance with one config entry
+whose plots are spread over the default profiles and start dates. Timed,
+best of `--rounds` (seconds):
+
+  seed_s              add_plots + deploy_many for the whole farm
+  deploy_s            one Runtime.deploy (queue, save, broadcast)
+  deploy_burst_s      100 concurrent deploys, plus the batches they took
+  broadcast_s         every plot marked dirty, _broadcast and the state writes it fans out to
+                      (sensor snapshots cleared first, so every sensor writes)
+  broadcast_skipped_s the same with unchanged snapshots: signals only, every write skipped
+  plot_sensor_s       state + attributes snapshot of every plot sensor (uncached)
+  calendar_month_s    MicrogreensCalendar.async_get_events over the next 31 days
+  calendar_year_s     ... over the next 365 days
+  watering_s          _watering_reminder for every plot at once
+  store_append_s      journal write of the whole farm into a fresh MicrogreensStore (no compaction)
+  store_replay_s      loading that journal back (replay, no compaction)
+  store_compact_s     the same write with compaction forced, i.e. append + snapshot rewrite
+  store_load_s        loading the compacted snapshot
+
+Prints one JSON document so results can be diffed between releases.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant import loader  # noqa: E402
+from homeassistant.helpers import storage  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+import homeassistant.util.dt as dt_util  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+mg = importlib.import_module("custom_components.ha-microgreens")
+mg_sensor = importlib.import_module("custom_components.ha-microgreens.sensor")
+mg_calendar = importlib.import_module("custom_components.ha-microgreens.calendar")
+mg_journal = importlib.import_module("custom_components.ha-microgreens.journal")
+
+PROFILES = ("rukola", "koriandr", "redkvicka", "hrasek", "horcice")
+
+
+def farm(n: int) -> tuple[list[dict], list[dict]]:
+    """Plots plus a deployment on every plot, mixed profiles and start dates."""
+    start = date.today() - timedelta(days=10)
+    plots = [{"plot_id": f"P{i}", "label": f"Plot P{i}"} for i in range(n)]
+    deps = [{
+        "plot_id": f"P{i}",
+        "profile_id": PROFILES[i % len(PROFILES)],
+        "start_date": (start + timedelta(days=i % 14)).isoformat(),
+    } for i in range(n)]
+    return plots, deps
+
+
+async def best(rounds: int, fn, setup=None) -> float:
+    """Fastest of `rounds` runs of the coroutine function `fn`; `setup(r)` runs untimed before each."""
+    times = []
+    for r in range(rounds):
+        if setup is not None:
+            setup(r)
+        t0 = perf_counter()
+        await fn(r)
+        times.append(perf_counter() - t0)
+    return round(min(times), 6)
+
+
+async def bench_farm(n: int, rounds: int) -> dict:
+    async with async_test_home_assistant() as hass:
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)  # allow custom_components/
+        entry = MockConfigEntry(domain=mg.DOMAIN, title="Microgreens", data={}, options={"save_delay": 0})
+        entry.add_to_hass(hass)
+        assert await async_setup_component(hass, mg.DOMAIN, {})
+        await hass.async_block_till_done()
+        rt = hass.data[mg.DOMAIN][entry.entry_id]
+        plots, deps = farm(n)
+
+        t0 = perf_counter()
+        await rt.add_plots(plots)
+        await rt.deploy_many(deps)
+        await hass.async_block_till_done()
+        res = {"seed_s": round(perf_counter() - t0, 6)}
+
+        today = date.today().isoformat()
+
+        async def deploy(r):
+            await rt.deploy(f"P{r % n}", PROFILES[r % len(PROFILES)], today)
+            await hass.async_block_till_done()
+
+        res["deploy_s"] = await best(rounds, deploy)
+
+        burst = min(n, 100)
+        before = rt.mutations.batches
+
+        async def deploy_burst(_r):
+            await asyncio.gather(*(rt.deploy(f"P{i}", PROFILES[i % len(PROFILES)], today) for i in range(burst)))
+            await hass.async_block_till_done()
+
+        res["deploy_burst_s"] = await best(rounds, deploy_burst)
+        res["deploy_burst_size"] = burst
+        res["deploy_burst_batches"] = round((rt.mutations.batches - before) / rounds, 2)
+
+        async def broadcast(_r):
+            rt._dirty_plots.update(rt.data.plots)
+            rt._broadcast()
+            await hass.async_block_till_done()
+
+        # plot sensors skip writes whose snapshot didn't change; forget the
+        # cached ones so the write path is what gets timed
+        live = [e for e in hass.data["sensor"].entities if isinstance(e, mg_sensor.MicrogreensPlotSensor)]
+
+        def forget_snapshots(_r):
+            for e in live:
+                e._snap = None
+
+        res["broadcast_s"] = await best(rounds, broadcast, setup=forget_snapshots)
+        res["broadcast_skipped_s"] = await best(rounds, broadcast)
+
+        sensors = [mg_sensor.MicrogreensPlotSensor(rt, pid) for pid in rt.data.plots]
+
+        async def plot_sensors(_r):
+            # the properties serve a cached snapshot; time what a refresh rebuilds
+            for s in sensors:
+                s._compute()
+
+        res["plot_sensor_s"] = await best(rounds, plot_sensors)
+
+        cal = mg_calendar.MicrogreensCalendar(rt)
+        now = dt_util.now()
+        for label, days in (("month", 31), ("year", 365)):
+            events = []
+
+            async def window(_r, days=days):
+                events[:] = await cal.async_get_events(hass, now, now + timedelta(days=days))
+
+            res[f"calendar_{label}_s"] = await best(rounds, window)
+            res[f"calendar_{label}_events"] = len(events)
+
+        # _watering_reminder only advances due dates once a notification went out
+        hass.services.async_register("notify", "notify", lambda call: None)
+        due = set(rt.data.deployments)
+
+        def make_due(_r):
+            # the previous round advanced every plot; put them all back on today
+            # so each round takes the notify + advance path, not the no-op one
+            today = dt_util.now().date()
+            for dep in rt.data.deployments.values():
+                dep.next_watering_due = today
+
+        async def watering(_r):
+            await rt._watering_reminder(due)
+            await hass.async_block_till_done()
+
+        res["watering_s"] = await best(rounds, watering, setup=make_due)
+
+        # two entries per plot cross JOURNAL_COMPACT_THRESHOLD from 250 plots up,
+        # so appends/replays run with compaction off and compaction is timed apart
+        async def clear(key: str) -> None:
+            # the test config dir outlives this run; start every store from nothing
+            await storage.async_remove_store(hass, key)
+            await hass.async_add_executor_job(
+                mg_journal.JsonLinesFile(hass.config.path(storage.STORAGE_DIR, f"{key}.journal")).truncate
+            )
+
+        async def write_farm(key: str, compact_threshold: float) -> None:
+            store = mg.MicrogreensStore(hass, key, compact_threshold=compact_threshold)
+            for plot in rt.data.plots.values():
+                store.record("plot_add", "plots", plot.id, plot.to_dict())
+            for dep in rt.data.deployments.values():
+                store.record("deploy", "deployments", dep.plot_id, dep.to_dict())
+            await store.async_save(rt.data)
+
+        def load(key: str):
+            return mg.MicrogreensStore(hass, key, compact_threshold=float("inf")).async_load()
+
+        journal_keys = [f"{mg.STORAGE_KEY}.bench_journal{r}" for r in range(rounds)]
+        snapshot_keys = [f"{mg.STORAGE_KEY}.bench_snapshot{r}" for r in range(rounds)]
+        for key in journal_keys + snapshot_keys:
+            await clear(key)
+        res["store_append_s"] = await best(rounds, lambda r: write_farm(journal_keys[r], float("inf")))
+        res["store_replay_s"] = await best(rounds, lambda r: load(journal_keys[r]))
+        res["store_compact_s"] = await best(rounds, lambda r: write_farm(snapshot_keys[r], 1))
+        res["store_load_s"] = await best(rounds, lambda r: load(snapshot_keys[r]))
+        for key in journal_keys + snapshot_keys:
+            await clear(key)
+        res["queue"] = rt.mutations.metrics()
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        await hass.async_stop(force=True)
+    return res
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--plots", type=int, nargs="*", default=[10, 1000, 10000])
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+    results = {str(n): asyncio.run(bench_farm(n, args.rounds)) for n in args.plots}
+    json.dump({"benchmark": "runtime", "results": results}, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,45 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from importlib import resources
 import os
-from dataclasses import dataclass, field, asdict
-from dataclasses import fields as dc_fields
-from datetime import date, time, timedelta
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
 from datetime import time as dtime
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.const import Platform
-from homeassistant.helpers import storage, dispatcher, event as ha_event
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, Platform
+from homeassistant.helpers import storage, dispatcher, entity_registry as er, event as ha_event
+from homeassistant.helpers.start import async_at_started
 from homeassistant.components.http import StaticPathConfig
+import homeassistant.util.dt as dt_util
+from homeassistant.util import slugify
 
 from .frontend import MicrogreensCardRegistration
+from .history import HarvestHistory
+from .agenda import KINDS as AGENDA_KINDS, AgendaIndex
+from .intervals import IntervalIndex
+from .scheduler import TransitionScheduler
+from . import websocket
+from .journal import JsonLinesFile, replay
+from .lifecycle import Lifecycle, PhaseTimer
+from .metrics import Metrics
+from .mutations import MutationQueue
 
 from .const import (
-    DOMAIN, STORAGE_KEY, STORAGE_VERSION,
-    SIGNAL_DATA_UPDATED, SIGNAL_NEW_PLOT,
-    SIGNAL_REMOVE_PLOT,
+    DOMAIN, STORAGE_KEY, STORAGE_VERSION, JOURNAL_COMPACT_THRESHOLD,
+    SIGNAL_NEW_PLOT,
+    SIGNAL_REMOVE_PLOT, SIGNAL_PLOT_UPDATED,
+    SIGNAL_META_UPDATED, SIGNAL_CALENDAR_UPDATED,
+    CONF_SITE, CONF_DEBUG_METRICS, KEY_SITES,
     DEFAULT_CALENDAR, DEFAULT_NOTIFY, DEFAULT_TITLE_PREFIX,
-    DEFAULT_WATERING_TIME, DEFAULT_SUMMARY_TIME, KEY_FRONTEND_BASE
+    DEFAULT_WATERING_TIME, DEFAULT_SUMMARY_TIME, DEFAULT_SAVE_DELAY, WATERING_RETRY_MINUTES,
+    KEY_FRONTEND_BASE
 )
 
 
@@ -32,12 +47,32 @@ PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.CALENDAR]  # <-- add CALE
 
 _LOGGER = logging.getLogger(__name__)
 _FRONTEND_URL_BASE = "/microgreens-frontend"  # static mount of packaged assets
+T = TypeVar("T")
 
 
 
 # --------------------------- Data Model ---------------------------
 
-@dataclass
+def _parse_hms(v) -> Optional[time]:
+    """Parse HH:MM[:SS] (a time passes through); empty means "use the global option"."""
+    if v is None or isinstance(v, time):
+        return v
+    if not str(v).strip():
+        return None
+    parts = [int(x) for x in str(v).split(":")]
+    while len(parts) < 3:
+        parts.append(0)
+    return time(*parts[:3])
+
+
+def _fmt_hms(t: Optional[time]) -> str:
+    return t.strftime("%H:%M:%S") if t else ""
+
+
+# Slotted dataclasses with hand-written codecs: no per-instance __dict__, and
+# (de)serialisation is a flat dict literal instead of asdict()'s recursive deep copy.
+
+@dataclass(slots=True)
 class Profile:
     id: str
     name: str
@@ -45,75 +80,308 @@ class Profile:
     uncover_days: int
     watering_frequency_days: int = 1
     notes: str = ""
+    watering_time: Optional[time] = None  # None = global watering_time option
 
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Profile":
+        return cls(
+            raw["id"], raw["name"], int(raw.get("cover_days", 0)), int(raw.get("uncover_days", 0)),
+            int(raw.get("watering_frequency_days", 1)), raw.get("notes", ""),
+            _parse_hms(raw.get("watering_time")),
+        )
 
-@dataclass
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id, "name": self.name, "cover_days": self.cover_days,
+            "uncover_days": self.uncover_days, "watering_frequency_days": self.watering_frequency_days,
+            "notes": self.notes, "watering_time": _fmt_hms(self.watering_time),
+        }
+
+
+@dataclass(slots=True)
 class Plot:
     id: str
     label: str
 
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Plot":
+        return cls(raw["id"], raw.get("label") or raw["id"])
 
-@dataclass
+    def to_dict(self) -> dict:
+        return {"id": self.id, "label": self.label}
+
+
+@dataclass(slots=True)
 class Deployment:
+    """Dates are held as `date` objects; ISO strings exist only in storage and attributes."""
     plot_id: str
     sticker: str
     plant_id: str
     plant_name: str
-    start_date: str
-    cover_end: str
-    harvest_date: str
+    start_date: date
+    cover_end: date
+    harvest_date: date
     watering_every_days: int
-    next_watering_due: str
+    next_watering_due: date
     notes: str = ""
+    watering_time: Optional[time] = None  # copied from the profile at deploy time
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Deployment":
+        iso = date.fromisoformat
+        return cls(
+            raw["plot_id"], raw.get("sticker") or raw["plot_id"], raw["plant_id"], raw.get("plant_name", ""),
+            iso(raw["start_date"]), iso(raw["cover_end"]), iso(raw["harvest_date"]),
+            int(raw.get("watering_every_days", 1)), iso(raw["next_watering_due"]), raw.get("notes", ""),
+            _parse_hms(raw.get("watering_time")),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "plot_id": self.plot_id, "sticker": self.sticker, "plant_id": self.plant_id,
+            "plant_name": self.plant_name, "start_date": self.start_date.isoformat(),
+            "cover_end": self.cover_end.isoformat(), "harvest_date": self.harvest_date.isoformat(),
+            "watering_every_days": self.watering_every_days,
+            "next_watering_due": self.next_watering_due.isoformat(), "notes": self.notes,
+            "watering_time": _fmt_hms(self.watering_time),
+        }
+
+    def phase(self, today: date) -> str:
+        if today < self.cover_end:
+            return "covered"
+        if today < self.harvest_date:
+            return "uncovered"
+        return "mature"
 
 @dataclass
 class MicrogreensData:
-    plots: list[Plot]
-    profiles: list[Profile]
-    deployments: list[Deployment]
+    """In-memory model; every collection is a dict keyed by id for O(1) lookups.
+
+    Dicts keep insertion order, so iteration (and the serialized lists) stay
+    stable across load/save.
+    """
+    plots: dict[str, Plot] = field(default_factory=dict)
+    profiles: dict[str, Profile] = field(default_factory=dict)
+    deployments: dict[str, Deployment] = field(default_factory=dict)  # keyed by plot_id
 
     @classmethod
     def from_dict(cls, raw: dict | None) -> "MicrogreensData":
         raw = raw or {}
-        d = cls(plots=[], profiles=[], deployments=[])
+        d = cls()
         for x in raw.get("plots", []):
-            d.plots.append(Plot(**x))
+            p = Plot.from_dict(x)
+            d.plots[p.id] = p
         for x in raw.get("profiles", []):
-            d.profiles.append(Profile(**x))
-        valid = {f.name for f in dc_fields(Deployment)}
+            p = Profile.from_dict(x)
+            d.profiles[p.id] = p
         for x in raw.get("deployments", []):
-            x = {k: v for k, v in dict(x).items() if k in valid}
-            d.deployments.append(Deployment(**x))
+            dep = Deployment.from_dict(x)
+            d.deployments[dep.plot_id] = dep
         return d
 
     def to_dict(self) -> dict:
         return {
-            "plots": [asdict(p) for p in self.plots],
-            "profiles": [asdict(p) for p in self.profiles],
-            "deployments": [asdict(d) for d in self.deployments],
+            "plots": [p.to_dict() for p in self.plots.values()],
+            "profiles": [p.to_dict() for p in self.profiles.values()],
+            "deployments": [d.to_dict() for d in self.deployments.values()],
         }
 
 
+class _SnapshotStore(storage.Store):
+    async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
+        if old_major_version < 2:
+            # v1 was a full document rewritten on every change; it becomes the
+            # first v2 snapshot with an empty journal behind it
+            return {**(old_data or {}), "seq": 0}
+        return old_data
+
+
 class MicrogreensStore:
-    def __init__(self, hass: HomeAssistant):
-        self._store = storage.Store(hass, STORAGE_VERSION, STORAGE_KEY)
+    """Compacted snapshot (HA Store, v2) plus an append-only mutation journal.
+
+    Mutations are recorded as journal entries and appended in batches; the
+    full snapshot is only rewritten when the journal grows past
+    `compact_threshold` (JOURNAL_COMPACT_THRESHOLD) entries.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str = STORAGE_KEY, save_delay: float = 0,
+                 metrics: Metrics | None = None, compact_threshold: float = JOURNAL_COMPACT_THRESHOLD):
+        self.hass = hass
+        self.metrics = metrics or Metrics()
+        self.compact_threshold = compact_threshold
+        self._store = _SnapshotStore(hass, STORAGE_VERSION, key)
+        self._journal = JsonLinesFile(hass.config.path(storage.STORAGE_DIR, f"{key}.journal"))
+        # max seconds a change may wait before it is written; 0 = write-through
+        self.save_delay = save_delay
+        self._data: MicrogreensData | None = None
+        self._buffer: list[dict] = []
+        self._seq = 0
+        self._journal_len = 0
+        self._deadline: float | None = None
+        self._unsub_timer = None
+        self._unsub_final = None
+        self._lock = asyncio.Lock()
 
     async def async_load(self) -> MicrogreensData:
         raw = await self._store.async_load() or {}
-        return MicrogreensData.from_dict(raw)
+        snap_seq = raw.pop("seq", 0)
+        entries = await self.hass.async_add_executor_job(self._journal.read)
+        self._seq = replay(raw, entries, snap_seq)
+        self._journal_len = len(entries)
+        self._data = MicrogreensData.from_dict(raw)
+        if self._journal_len >= self.compact_threshold:
+            await self._async_compact()
+        return self._data
+
+    @property
+    def journal_len(self) -> int:
+        """Entries written since the last compaction."""
+        return self._journal_len
+
+    @callback
+    def record(self, op: str, collection: str, key: str, value: dict | None) -> None:
+        """Queue one mutation; `value` must already be serialized (None = delete)."""
+        self._seq += 1
+        self._buffer.append({"seq": self._seq, "op": op, "c": collection, "k": key, "v": value})
 
     async def async_save(self, data: MicrogreensData) -> None:
-        await self._store.async_save(data.to_dict())
+        self._data = data
+        if self.save_delay <= 0:
+            await self._async_write()
+            return
+        self.async_schedule_save()
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Coalesce writes; the first change of a window fixes its deadline.
+
+        A burst of changes produces one journal append at most `save_delay`
+        seconds after the first of them, instead of being postponed for as
+        long as the burst lasts.
+        """
+        if self._deadline is not None:
+            return
+        self._deadline = self.hass.loop.time() + self.save_delay
+        self._unsub_timer = ha_event.async_call_later(self.hass, self.save_delay, self._async_timer_fired)
+        if self._unsub_final is None:
+            self._unsub_final = self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+            )
+
+    async def _async_timer_fired(self, _now) -> None:
+        self._unsub_timer = None
+        await self._async_write()
+
+    async def _async_final_write(self, _event) -> None:
+        self._unsub_final = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Write any pending change now (unload / shutdown)."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        await self._async_write()
+
+    async def async_close(self) -> None:
+        """Flush and drop the shutdown hook (entry unload)."""
+        if self._unsub_final:
+            self._unsub_final()
+            self._unsub_final = None
+        await self.async_flush()
+
+    async def _async_write(self) -> None:
+        async with self._lock:
+            self._deadline = None
+            entries, self._buffer = self._buffer, []
+            if entries:
+                t0 = self.metrics.clock()
+                size = await self.hass.async_add_executor_job(self._journal.append, entries)
+                self.metrics.timed("store_save", t0, bytes=size, entries=len(entries))
+                self._journal_len += len(entries)
+            if self._journal_len >= self.compact_threshold:
+                await self._async_compact()
+
+    async def _async_compact(self) -> None:
+        # the snapshot includes every recorded mutation, so buffered entries are
+        # redundant; it also records the seq it covers, so a crash between the
+        # two steps only means those entries are skipped on the next replay
+        t0 = self.metrics.clock()
+        snapshot = {**self._data.to_dict(), "seq": self._seq}
+        self._buffer.clear()
+        await self._store.async_save(snapshot)
+        await self.hass.async_add_executor_job(self._journal.truncate)
+        self.metrics.timed("store_compact", t0)
+        _LOGGER.debug("Compacted %d journal entries into the snapshot", self._journal_len)
+        self._journal_len = 0
 
 # --------------------------- Integration runtime ---------------------------
 
+def _storage_key(entry: ConfigEntry) -> str:
+    """Entries from before multi-site support keep the original single-site files."""
+    return STORAGE_KEY if CONF_SITE not in entry.data else f"{STORAGE_KEY}.{entry.entry_id}"
+
+
 class Runtime:
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
         self.hass = hass
         self.entry = entry
-        self.store = MicrogreensStore(hass)
-        self.data = MicrogreensData(plots=[], profiles=[], deployments=[])
-        self._unsubs: list[callable] = []
+        # hot-path counters/latencies; no-ops unless the debug_metrics option is on
+        self.metrics = Metrics(bool(entry.options.get(CONF_DEBUG_METRICS, False)))
+        self.store = MicrogreensStore(hass, self.storage_key, metrics=self.metrics)
+        self.history = HarvestHistory(hass, self.storage_key)
+        self.data = MicrogreensData()
+        # deployment [start, harvest] spans by plot_id, kept in step by the mutation helpers
+        self.intervals = IntervalIndex()
+        # uncover/harvest/watering plot sets by day, kept in step likewise
+        self.agenda = AgendaIndex()
+        # next moment each occupied plot's sensor output changes
+        self.scheduler = TransitionScheduler(hass, self._on_transitions)
+        # next watering reminder per occupied plot (minute resolution, so plots
+        # due in the same minute share one notification)
+        self.watering = TransitionScheduler(hass, self._on_watering_due)
+        # every timer/listener/subscription this entry registers, undone on unload
+        self.lifecycle = Lifecycle()
+        self.timing = PhaseTimer()  # setup phases, reported once the entry is up
+        # every model change goes through here: one writer, one save per burst
+        self.mutations = MutationQueue(hass, self._commit, f"{DOMAIN} {entry.entry_id}")
+        # dirty sets collected by the mutation helpers, flushed by _broadcast()
+        self._dirty_plots: set[str] = set()
+        self._dirty_meta = False
+        self._dirty_calendar: set[str] = set()
+        # bumped on every profile/plot change; the card refetches meta over
+        # the websocket when the meta sensor reports a new revision
+        self.meta_revision = 0
+        self._meta: Optional[dict] = None
+        # microgreens/subscribe websocket connections
+        self._delta_listeners: set[Callable[[dict], None]] = set()
+
+    # ---- site identity
+    @property
+    def legacy(self) -> bool:
+        """Entries created before multi-site support keep their files and entity names."""
+        return CONF_SITE not in self.entry.data
+
+    @property
+    def site(self) -> str:
+        return slugify(self.entry.data.get(CONF_SITE) or self.entry.title)
+
+    @property
+    def storage_key(self) -> str:
+        return _storage_key(self.entry)
+
+    @property
+    def entity_prefix(self) -> str:
+        # the "microgreens" site keeps the original entity ids the cards default to
+        return "Microgreens" if self.site == DOMAIN else f"Microgreens {self.entry.data.get(CONF_SITE) or self.entry.title}"
+
+    @property
+    def device_name(self) -> str:
+        return "Microgreens Manager" if self.site == DOMAIN else self.entity_prefix
+
+    def signal(self, template: str, *args) -> str:
+        """This entry's instance of a SIGNAL_* template."""
+        return template.format(self.entry.entry_id, *args)
 
     # ---- options helpers
     @property
@@ -142,6 +410,13 @@ class Runtime:
         h, m, s = parts[:3]
         return time(hour=h, minute=m, second=s)
 
+    @property
+    def save_delay(self) -> float:
+        try:
+            return max(0.0, float(self.entry.options.get("save_delay", DEFAULT_SAVE_DELAY)))
+        except (TypeError, ValueError):
+            return float(DEFAULT_SAVE_DELAY)
+
     @property
     def watering_time(self) -> time:
         return self._opt_time("watering_time", DEFAULT_WATERING_TIME)
@@ -153,8 +428,21 @@ class Runtime:
     # ---- lifecycle
     async def async_load(self):
         self.data = await self.store.async_load()
+        self.intervals = IntervalIndex()
+        self.agenda = AgendaIndex()
+        for dep in self.data.deployments.values():
+            self._index_deployment(dep)
+        if self._seed_defaults():
+            _LOGGER.info("Seeded default profiles")
+            await self.store.async_save(self.data)
+
+    def _seed_defaults(self) -> bool:
+        """Add default plots (only on an empty store) and any missing default profiles."""
+        added = False
         if not self.data.plots:
-            self.data.plots = [Plot(id=f"A{i}", label=f"Plot A{i}") for i in range(1, 7)]
+            for i in range(1, 7):
+                self._put_plot(Plot(id=f"A{i}", label=f"Plot A{i}"), op="seed")
+            added = True
 
         defaults = {
             "rukola":   Profile("rukola","Rukola",3,8,1),
@@ -163,60 +451,240 @@ class Runtime:
             "hrasek":   Profile("hrasek","Hrášek",5,16,1),
             "horcice":  Profile("horcice","Hořčice",3,11,1),
         }
-        have = {p.id for p in self.data.profiles}
-        added = False
         for k, v in defaults.items():
-            if k not in have:
-                self.data.profiles.append(v); added = True
-        if added:
-            _LOGGER.info("Seeded default profiles")
-            await self.store.async_save(self.data)
+            if k not in self.data.profiles:
+                self._put_profile(v, op="seed"); added = True
+        return added
 
 
     async def async_start(self):
+        self.store.save_delay = self.history.save_delay = self.save_delay
         await self.async_load()
+        self.timing.mark("store_load")
+        await self.history.async_load()
+        self.timing.mark("history_load")
+        # closed last (lifecycle undoes in reverse), after every timer that could still write
+        self.lifecycle.add("storage", self.store.async_close)
+        self.lifecycle.add("storage", self.history.async_close)
+        self.lifecycle.add("queue", self.mutations.async_close)
         self._schedule_jobs()
-        self._register_services()
+        self.scheduler.async_start()
+        self.lifecycle.add("timer", self.scheduler.async_stop)
+        # overdue reminders fire as soon as the scheduler starts; wait until the
+        # notify platforms are up, or the catch-up reminder has nowhere to go
+        self.lifecycle.add("timer", async_at_started(self.hass, self._start_watering))
+        self.lifecycle.add("timer", self.watering.async_stop)
+        self.timing.mark("schedule")
         _LOGGER.info("Microgreens started; %d profiles, %d plots, %d deployments",
             len(self.data.profiles), len(self.data.plots), len(self.data.deployments))
 
     async def async_stop(self):
-        for u in self._unsubs:
-            u()
-        self._unsubs.clear()
+        await self.lifecycle.async_close()
+        self._delta_listeners.clear()
+
+    @callback
+    def _spawn(self, coro, name: str) -> None:
+        """Run a job owned by this entry; unload cancels it before the queue and stores close."""
+        task = self.entry.async_create_background_task(self.hass, coro, f"{DOMAIN} {self.site} {name}")
+        handle = self.lifecycle.add("task", task.cancel)
+        task.add_done_callback(lambda _task: self.lifecycle.discard(handle))
 
     def _schedule_jobs(self):
         @callback
         def _summary_cb(now):
-            self.hass.async_create_task(self._daily_summary())
-
-        @callback
-        def _water_cb(now):
-            self.hass.async_create_task(self._watering_reminder())
+            self._spawn(self._daily_summary(), "daily summary")
 
-        self._unsubs.append(
-            ha_event.async_track_time_change(
-                self.hass, _summary_cb,
-                hour=self.summary_time.hour, minute=self.summary_time.minute, second=self.summary_time.second
-            )
-        )
-        self._unsubs.append(
-            ha_event.async_track_time_change(
-                self.hass, _water_cb,
-                hour=self.watering_time.hour, minute=self.watering_time.minute, second=self.watering_time.second
-            )
-        )
+        self.lifecycle.add("timer", ha_event.async_track_time_change(
+            self.hass, _summary_cb,
+            hour=self.summary_time.hour, minute=self.summary_time.minute, second=self.summary_time.second
+        ))
 
-        @callback
-        def _midnight_cb(now):
-            dispatcher.async_dispatcher_send(self.hass, SIGNAL_DATA_UPDATED)
-        self._unsubs.append(
-            ha_event.async_track_time_change(self.hass, _midnight_cb, hour=0, minute=0, second=0)
-        )
+    async def _mutate(self, fn: Callable[[], T]) -> T:
+        """Apply `fn` to the model through the mutation queue; returns once it is saved."""
+        return await self.mutations.submit(fn)
 
-    async def _save_and_broadcast(self):
+    async def _commit(self):
+        """Persist and announce one batch of queued changes."""
         await self.store.async_save(self.data)
-        dispatcher.async_dispatcher_send(self.hass, SIGNAL_DATA_UPDATED)
+        self._broadcast()
+        await self.history.async_save()
+
+    @callback
+    def _broadcast(self):
+        """Signal only the entities touched since the last broadcast."""
+        t0 = self.metrics.clock()
+        plots, self._dirty_plots = self._dirty_plots, set()
+        for plot_id in plots:
+            dispatcher.async_dispatcher_send(self.hass, self.signal(SIGNAL_PLOT_UPDATED, plot_id))
+        if self._dirty_meta:
+            self._dirty_meta = False
+            self.meta_revision += 1
+            self._meta = None
+            dispatcher.async_dispatcher_send(self.hass, self.signal(SIGNAL_META_UPDATED))
+            meta_changed = True
+        else:
+            meta_changed = False
+        if self._delta_listeners and (plots or meta_changed):
+            delta = {"plots": {pid: self.plot_view(pid) for pid in plots}}
+            if meta_changed:
+                delta["meta"] = self.meta()
+            for listener in list(self._delta_listeners):
+                listener(delta)
+        if self._dirty_calendar:
+            changed, self._dirty_calendar = self._dirty_calendar, set()
+            dispatcher.async_dispatcher_send(self.hass, self.signal(SIGNAL_CALENDAR_UPDATED), changed)
+        self.metrics.timed("broadcast", t0, plots=len(plots))
+
+    def meta(self) -> dict:
+        """Profiles and plots as the cards consume them; rebuilt once per revision."""
+        if self._meta is None:
+            self._meta = {
+                "revision": self.meta_revision,
+                "profiles": [{
+                    "id": p.id, "name": p.name, "cover_days": p.cover_days,
+                    "uncover_days": p.uncover_days, "water": p.watering_frequency_days,
+                    "notes": p.notes, "watering_time": p.watering_time.strftime("%H:%M") if p.watering_time else "",
+                } for p in self.data.profiles.values()],
+                "plots": [{"id": p.id, "label": p.label} for p in self.data.plots.values()],
+            }
+        return self._meta
+
+    def plot_view(self, plot_id: str) -> Optional[dict]:
+        """What a card tile shows for one plot; None once the plot is gone."""
+        plot = self.data.plots.get(plot_id)
+        if plot is None:
+            return None
+        dep = self.data.deployments.get(plot_id)
+        if not dep:
+            return {"id": plot.id, "label": plot.label, "state": "idle"}
+        today = dt_util.now().date()
+        return {
+            "id": plot.id, "label": plot.label, "state": dep.phase(today),
+            "sticker": dep.sticker, "plant_id": dep.plant_id, "plant_name": dep.plant_name,
+            "days_since_planting": max(0, (today - dep.start_date).days),
+            "cover_end": dep.cover_end.isoformat(), "harvest_date": dep.harvest_date.isoformat(),
+            "next_watering_due": dep.next_watering_due.isoformat(),
+        }
+
+    def snapshot(self) -> dict:
+        return {"meta": self.meta(), "plots": {pid: self.plot_view(pid) for pid in self.data.plots}}
+
+    def agenda_between(self, start: date, end: date) -> dict:
+        """{iso day: {kind: [{plot_id, plant_name}]}} for days in [start, end] with anything on them."""
+        deps = self.data.deployments
+        return {
+            day.isoformat(): {
+                kind: [{"plot_id": pid, "plant_name": deps[pid].plant_name} for pid in sorted(bucket[kind])]
+                for kind in AGENDA_KINDS if kind in bucket
+            }
+            for day, bucket in self.agenda.between(start, end)
+        }
+
+    def debug_info(self) -> dict:
+        """Collection sizes, queue/registration counts and (when enabled) hot-path metrics."""
+        return {
+            "sizes": {
+                "plots": len(self.data.plots),
+                "profiles": len(self.data.profiles),
+                "deployments": len(self.data.deployments),
+                "intervals": len(self.intervals),
+                "agenda_days": self.agenda.days,
+                "scheduled_transitions": len(self.scheduler),
+                "scheduled_waterings": len(self.watering),
+                "journal_entries": self.store.journal_len,
+                "delta_listeners": len(self._delta_listeners),
+            },
+            "queue": self.mutations.metrics(),
+            "registrations": self.lifecycle.counts(),
+            "setup_ms": dict(self.timing.phases),
+            "metrics": self.metrics.snapshot(),
+        }
+
+    @callback
+    def async_subscribe_deltas(self, listener: Callable[[dict], None]) -> Callable[[], None]:
+        """Call `listener` with {"plots": {id: view-or-None}, ["meta": ...]} after each change."""
+        self._delta_listeners.add(listener)
+        return lambda: self._delta_listeners.discard(listener)
+
+    # ---- mutation helpers (every model change goes through these; `op` names
+    # the journal entry)
+    def _put_profile(self, prof: Profile, op: str = "profile_upsert"):
+        self.data.profiles[prof.id] = prof
+        self.store.record(op, "profiles", prof.id, prof.to_dict())
+        self._dirty_meta = True
+
+    def _del_profile(self, pid: str, op: str = "profile_delete"):
+        if self.data.profiles.pop(pid, None):
+            self.store.record(op, "profiles", pid, None)
+            self._dirty_meta = True
+
+    def _put_plot(self, plot: Plot, op: str = "plot_add"):
+        self.data.plots[plot.id] = plot
+        self.store.record(op, "plots", plot.id, plot.to_dict())
+        self._dirty_meta = True
+        self._dirty_plots.add(plot.id)
+
+    def _del_plot(self, plot_id: str, op: str = "plot_remove"):
+        self._del_deployment(plot_id, op=op)
+        if self.data.plots.pop(plot_id, None):
+            self.store.record(op, "plots", plot_id, None)
+            self._dirty_meta = True
+            self._dirty_plots.add(plot_id)
+
+    def _put_deployment(self, dep: Deployment, op: str = "deploy"):
+        self.data.deployments[dep.plot_id] = dep
+        self.store.record(op, "deployments", dep.plot_id, dep.to_dict())
+        self._index_deployment(dep)
+        self._dirty_plots.add(dep.plot_id)
+        self._dirty_calendar.add(dep.plot_id)
+
+    def _del_deployment(self, plot_id: str, op: str = "harvest") -> Optional[Deployment]:
+        dep = self.data.deployments.pop(plot_id, None)
+        if dep:
+            self.store.record(op, "deployments", plot_id, None)
+            self.intervals.remove(plot_id)
+            self.agenda.remove(plot_id)
+            self.scheduler.cancel(plot_id)
+            self.watering.cancel(plot_id)
+            self._dirty_plots.add(plot_id)
+            self._dirty_calendar.add(plot_id)
+        return dep
+
+    def _index_deployment(self, dep: Deployment):
+        # calendar span is start .. harvest day inclusive, stored end-exclusive
+        self.intervals.put(
+            dep.plot_id,
+            dep.start_date.toordinal(),
+            dep.harvest_date.toordinal() + 1,
+        )
+        self.agenda.put(dep)
+        self.scheduler.schedule(dep.plot_id, self._transitions(dep, dt_util.now()))
+        self.watering.schedule(dep.plot_id, [self.watering_due_at(dep)])
+
+    # ---- phase transitions
+    def watering_due_at(self, dep: Deployment) -> datetime:
+        t = (dep.watering_time or self.watering_time).replace(second=0, microsecond=0)
+        return datetime.combine(dep.next_watering_due, t, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+
+    def _transitions(self, dep: Deployment, now: datetime) -> list[datetime]:
+        """Moments at which the plot's sensor output next changes.
+
+        State and days_since_planting both roll over at local midnight; the
+        counter only starts moving the day after planting.
+        """
+        first_tick = max(now.date(), dep.start_date) + timedelta(days=1)
+        return [dt_util.start_of_local_day(first_tick)]
+
+    @callback
+    def _on_transitions(self, plot_ids: set[str]):
+        self.metrics.count("scheduler_fires")
+        now = dt_util.now()
+        for plot_id in plot_ids:
+            dep = self.data.deployments.get(plot_id)
+            if dep:
+                self.scheduler.schedule(plot_id, self._transitions(dep, now))
+                self._dirty_plots.add(plot_id)
+        self._broadcast()
 
     # ---- CRUD
     async def add_or_update_profile(self, p: dict):
@@ -228,97 +696,185 @@ class Runtime:
             uncover_days=int(p.get("uncover_days", 0)),
             watering_frequency_days=int(p.get("watering_frequency_days", 1)),
             notes=p.get("notes", ""),
+            watering_time=self._profile_time(p.get("watering_time")),
         )
-        existing = next((x for x in self.data.profiles if x.id == obj.id), None)
-        if existing:
-            self.data.profiles = [obj if x.id == obj.id else x for x in self.data.profiles]
-            _LOGGER.info("Updated profile %s", obj.id)
-        else:
-            self.data.profiles.append(obj)
-            _LOGGER.info("Added profile %s", obj.id)
-        await self._save_and_broadcast()
+
+        def apply() -> bool:
+            existing = self.data.profiles.get(obj.id)
+            if existing and "watering_time" not in p:
+                obj.watering_time = existing.watering_time  # not part of this call; keep it
+            self._put_profile(obj)
+            return existing is not None
+
+        existing = await self._mutate(apply)
+        _LOGGER.info("%s profile %s", "Updated" if existing else "Added", obj.id)
+
+    @staticmethod
+    def _profile_time(v) -> Optional[time]:
+        try:
+            return _parse_hms(v)
+        except (TypeError, ValueError) as err:
+            raise vol.Invalid(f"invalid watering_time {v!r}") from err
 
     async def delete_profile(self, pid: str):
-        self.data.profiles = [x for x in self.data.profiles if x.id != pid]
+        await self._mutate(lambda: self._del_profile(pid))
         _LOGGER.info("Deleted profile %s", pid)
-        await self._save_and_broadcast()
 
     async def add_plot(self, plot_id: str, label: Optional[str] = None):
-        if any(x.id == plot_id for x in self.data.plots):
+        def apply() -> bool:
+            if plot_id in self.data.plots:
+                return False
+            self._put_plot(Plot(id=plot_id, label=label or plot_id))
+            return True
+
+        if not await self._mutate(apply):
             return
-        self.data.plots.append(Plot(id=plot_id, label=label or plot_id))
         _LOGGER.info("Added plot %s", plot_id)
-        await self._save_and_broadcast()
-        dispatcher.async_dispatcher_send(self.hass, SIGNAL_NEW_PLOT, plot_id)
+        dispatcher.async_dispatcher_send(self.hass, self.signal(SIGNAL_NEW_PLOT), [plot_id])
 
     async def remove_plot(self, plot_id: str):
-        self.data.plots = [x for x in self.data.plots if x.id != plot_id]
-        self.data.deployments = [d for d in self.data.deployments if d.plot_id != plot_id]
+        await self._mutate(lambda: self._del_plot(plot_id))
         _LOGGER.info("Removed plot %s", plot_id)
-        await self._save_and_broadcast()
         # notify sensor platform to remove the entity
-        dispatcher.async_dispatcher_send(self.hass, SIGNAL_REMOVE_PLOT, plot_id)
+        dispatcher.async_dispatcher_send(self.hass, self.signal(SIGNAL_REMOVE_PLOT), plot_id)
 
     # ----- in Runtime.deploy(): no calendar service call, just state update
-    async def deploy(self, plot_id: str, profile_id: str, start_date: str, sticker: Optional[str] = None):
-        from datetime import date as _date, timedelta
-        prof = next((x for x in self.data.profiles if x.id == profile_id), None)
+    def _deploy_plan(self, plot_id: str, profile_id: str, start_date: str) -> tuple[Profile, date]:
+        if plot_id not in self.data.plots:
+            raise vol.Invalid(f"plot {plot_id} not found")
+        prof = self.data.profiles.get(profile_id)
         if not prof:
-            raise vol.Invalid("profile not found")
+            raise vol.Invalid(f"profile {profile_id} not found")
+        try:
+            return prof, date.fromisoformat(start_date)
+        except ValueError as err:
+            raise vol.Invalid(f"invalid start_date {start_date!r}") from err
 
-        sd = _date.fromisoformat(start_date)
+    def _apply_deploy(self, plot_id: str, prof: Profile, sd: date, sticker: Optional[str] = None) -> Deployment:
         cover_end = sd + timedelta(days=prof.cover_days)
         harvest   = sd + timedelta(days=prof.cover_days + prof.uncover_days)
         next_water = sd + timedelta(days=max(1, prof.watering_frequency_days))
 
         # replace any existing dep for this plot
-        self.data.deployments = [d for d in self.data.deployments if d.plot_id != plot_id]
-        self.data.deployments.append(Deployment(
+        dep = Deployment(
             plot_id=plot_id,
             sticker=sticker or plot_id,
             plant_id=prof.id,
             plant_name=prof.name,
-            start_date=sd.isoformat(),
-            cover_end=cover_end.isoformat(),
-            harvest_date=harvest.isoformat(),
+            start_date=sd,
+            cover_end=cover_end,
+            harvest_date=harvest,
             watering_every_days=prof.watering_frequency_days,
-            next_watering_due=next_water.isoformat(),
+            next_watering_due=next_water,
             notes=prof.notes,
-        ))
+            watering_time=prof.watering_time,
+        )
+        self._put_deployment(dep)
         _LOGGER.info("Deployed %s on %s (start=%s)", prof.name, plot_id, sd.isoformat())
-        await self._save_and_broadcast()
+        return dep
+
+    async def deploy(self, plot_id: str, profile_id: str, start_date: str, sticker: Optional[str] = None):
+        def apply():
+            # planned inside the batch, so a plot or profile changed by an earlier call in it is seen
+            prof, sd = self._deploy_plan(plot_id, profile_id, start_date)
+            self._apply_deploy(plot_id, prof, sd, sticker)
+
+        await self._mutate(apply)
 
     # ----- in Runtime.harvest() / unassign(): just remove deployment
+    def _apply_harvest(self, plot_id: str) -> Optional[Deployment]:
+        dep = self._del_deployment(plot_id)
+        if dep:
+            self.history.record(dep, dt_util.now().date())
+        return dep
+
     async def harvest(self, plot_id: str):
-        self.data.deployments = [d for d in self.data.deployments if d.plot_id != plot_id]
+        await self._mutate(lambda: self._apply_harvest(plot_id))
         _LOGGER.info("Harvested %s", plot_id)
-        await self._save_and_broadcast()
+
+    # ---- bulk variants: validate every item first, then apply the whole batch
+    # as one queued change
+    async def deploy_many(self, items: list[dict]) -> list[dict]:
+        return await self._mutate(lambda: self._apply_deploy_many(items))
+
+    def _apply_deploy_many(self, items: list[dict]) -> list[dict]:
+        plan, errors, seen = [], [], set()
+        for i, it in enumerate(items):
+            if it["plot_id"] in seen:
+                errors.append(f"item {i}: duplicate plot_id {it['plot_id']}")
+                continue
+            seen.add(it["plot_id"])
+            try:
+                plan.append((it, *self._deploy_plan(it["plot_id"], it["profile_id"], it["start_date"])))
+            except vol.Invalid as err:
+                errors.append(f"item {i}: {err}")
+        if errors:
+            raise vol.Invalid("; ".join(errors))
+
+        results = []
+        for it, prof, sd in plan:
+            dep = self._apply_deploy(it["plot_id"], prof, sd, it.get("sticker"))
+            results.append({
+                "plot_id": dep.plot_id, "profile_id": dep.plant_id, "start_date": dep.start_date.isoformat(),
+                "cover_end": dep.cover_end.isoformat(), "harvest_date": dep.harvest_date.isoformat(),
+            })
+        return results
+
+    async def harvest_many(self, plot_ids: list[str]) -> list[dict]:
+        results = await self._mutate(
+            lambda: [{"plot_id": pid, "harvested": self._apply_harvest(pid) is not None} for pid in plot_ids]
+        )
+        _LOGGER.info("Harvested %d plots", sum(r["harvested"] for r in results))
+        return results
+
+    async def add_plots(self, items: list[dict]) -> list[dict]:
+        def apply() -> list[dict]:
+            results = []
+            for it in items:
+                plot_id = it["plot_id"]
+                if plot_id in self.data.plots:
+                    results.append({"plot_id": plot_id, "added": False})
+                    continue
+                self._put_plot(Plot(id=plot_id, label=it.get("label") or plot_id))
+                results.append({"plot_id": plot_id, "added": True})
+            return results
+
+        results = await self._mutate(apply)
+        added = [r["plot_id"] for r in results if r["added"]]
+        if added:
+            _LOGGER.info("Added %d plots", len(added))
+            dispatcher.async_dispatcher_send(self.hass, self.signal(SIGNAL_NEW_PLOT), added)
+        return results
 
     async def unassign(self, plot_id: str):
-        await self.harvest(plot_id)
+        """Clear a plot without archiving: abandoned or mistaken deployments stay out of the history."""
+        await self._mutate(lambda: self._del_deployment(plot_id, op="unassign"))
+        _LOGGER.info("Cleared %s", plot_id)
 
     # ---- helpers
-    async def _notify(self, title: str, message: str):
+    async def _notify(self, title: str, message: str) -> bool:
+        """Send a notification; False when nothing was sent."""
         domain = "notify"
         try:
             service = self.notify_service.split(".")[1]
         except Exception:
             _LOGGER.warning("Invalid notify_service option '%s'", self.notify_service)
-            return
+            return False
         if not self.hass.services.has_service(domain, service):
             _LOGGER.warning("Notify service %s.%s not found; skipping", domain, service)
-            return
+            self.metrics.count("notify_skipped")
+            return False
+        t0 = self.metrics.clock()
         await self.hass.services.async_call(domain, service, {"title": title, "message": message}, blocking=False)
+        self.metrics.timed("notify", t0)
+        return True
 
     async def _daily_summary(self):
-        today = date.today().isoformat()
-        phase_changes = []
-        harvests = []
-        for d in self.data.deployments:
-            if d.cover_end == today:
-                phase_changes.append(f"{d.plot_id} ({d.plant_name}) → uncover")
-            if d.harvest_date == today:
-                harvests.append(f"{d.plot_id} ({d.plant_name}) harvest")
+        today = dt_util.now().date()
+        bucket = self.agenda.on(today)
+        deps = self.data.deployments
+        phase_changes = [f"{pid} ({deps[pid].plant_name}) → uncover" for pid in sorted(bucket.get("uncover", ()))]
+        harvests = [f"{pid} ({deps[pid].plant_name}) harvest" for pid in sorted(bucket.get("harvest", ()))]
         lines = []
         if phase_changes:
             lines.append("Phase changes today: " + ", ".join(phase_changes))
@@ -326,17 +882,50 @@ class Runtime:
             lines.append("Ready to harvest: " + ", ".join(harvests))
         if not lines:
             lines.append("No phase changes today.")
-        await self._notify("Microgreens", "\n".join(lines))
-
-    async def _watering_reminder(self):
-        today = date.today()
-        due = [d for d in self.data.deployments if date.fromisoformat(d.next_watering_due) <= today]
+        await self._notify(self.entity_prefix, "\n".join(lines))
+
+    @callback
+    def _start_watering(self, _hass: HomeAssistant):
+        self.watering.async_start()
+
+    @callback
+    def _on_watering_due(self, plot_ids: set[str]):
+        self.metrics.count("watering_fires")
+        self._spawn(self._watering_reminder(plot_ids), "watering reminder")
+
+    async def _watering_reminder(self, plot_ids: set[str]):
+        """One notification for every plot that came due together, then advance each.
+
+        A plot that was due while HA was down is reminded once and moved to
+        its first due date after today, instead of one interval at a time.
+        If the notification could not be sent nothing is advanced and the
+        plots are put back on the scheduler (which already dropped them) for
+        another attempt WATERING_RETRY_MINUTES later.
+        """
+        today = dt_util.now().date()
+        due = [self.data.deployments[p] for p in sorted(plot_ids) if p in self.data.deployments]
         if not due:
             return
-        await self._notify("Microgreens", "Water today: " + ", ".join(f"{d.plot_id} ({d.plant_name})" for d in due))
-        for d in due:
-            d.next_watering_due = (date.fromisoformat(d.next_watering_due) + timedelta(days=max(1, d.watering_every_days))).isoformat()
-        await self._save_and_broadcast()
+        if not await self._notify(
+            self.entity_prefix, "Water today: " + ", ".join(f"{d.plot_id} ({d.plant_name})" for d in due)
+        ):
+            retry = (dt_util.now() + timedelta(minutes=WATERING_RETRY_MINUTES)).replace(second=0, microsecond=0)
+            for d in due:
+                if self.data.deployments.get(d.plot_id) is d:
+                    self.watering.schedule(d.plot_id, [retry])
+            return
+
+        def apply():
+            for d in due:
+                # skip plots harvested or redeployed while the notification was sent
+                if self.data.deployments.get(d.plot_id) is not d:
+                    continue
+                if d.next_watering_due <= today:
+                    step = max(1, d.watering_every_days)
+                    d.next_watering_due += timedelta(days=step * ((today - d.next_watering_due).days // step + 1))
+                self._put_deployment(d, op="water")
+
+        await self._mutate(apply)
 
 
 # --------------------------- HA entry points ---------------------------
@@ -365,32 +954,83 @@ async def _register_static_frontend(hass: HomeAssistant) -> str:
     return _FRONTEND_URL_BASE
 
 
+@callback
+def _migrate_unique_ids(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Move the single-site global unique ids onto the entry id."""
+    legacy = {"microgreens_meta": f"{entry.entry_id}_meta", "microgreens_calendar": f"{entry.entry_id}_calendar"}
+    reg = er.async_get(hass)
+    for ent in er.async_entries_for_config_entry(reg, entry.entry_id):
+        new = legacy.get(ent.unique_id)
+        if new and not reg.async_get_entity_id(ent.domain, DOMAIN, new):
+            reg.async_update_entity(ent.entity_id, new_unique_id=new)
+
+
+async def _async_setup_frontend(hass: HomeAssistant) -> None:
+    """Static paths and Lovelace resources, once per process after HA has started."""
+    timer = PhaseTimer()
+    hass.data[KEY_FRONTEND_BASE] = await _register_static_frontend(hass)
+    await MicrogreensCardRegistration(hass).async_register()
+    timer.mark("frontend")
+    _LOGGER.info("Microgreens frontend ready in %.1f ms", timer.total_ms)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    base = await _register_static_frontend(hass)
-    hass.data[KEY_FRONTEND_BASE] = base
     rt = Runtime(hass, entry)
+    if rt.legacy:
+        _migrate_unique_ids(hass, entry)
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = rt
-    card_reg = MicrogreensCardRegistration(hass)
-    await card_reg.async_register()
+    hass.data.setdefault(KEY_SITES, {})[rt.site] = entry.entry_id
+    rt.timing.mark("init")
     await rt.async_start()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    rt.timing.mark("platforms")
+    # options are read at start-up (times, save delay, debug sensor), so apply changes by reloading
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+    _LOGGER.info("Microgreens site %s set up in %.1f ms (%s)", rt.site, rt.timing.total_ms, rt.timing)
     return True
 
 
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    rt: Runtime = hass.data[DOMAIN][entry.entry_id]
-    await rt.async_stop()
     ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    if not hass.data.get(DOMAIN):
-        card_reg = MicrogreensCardRegistration(hass)
-        await card_reg.async_unregister()
     if ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        rt: Runtime = hass.data[DOMAIN].pop(entry.entry_id)
+        await rt.async_stop()
+        if hass.data.get(KEY_SITES, {}).get(rt.site) == entry.entry_id:
+            hass.data[KEY_SITES].pop(rt.site)
     return ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Lovelace resources are shared by every site and survive reloads; drop
+    # them only once the last entry is deleted
+    if all(e.entry_id == entry.entry_id for e in hass.config_entries.async_entries(DOMAIN)):
+        await MicrogreensCardRegistration(hass).async_unregister()
+
+    # the site's snapshot, journal, harvest archive and aggregates
+    key = _storage_key(entry)
+    await storage.async_remove_store(hass, key)
+    await storage.async_remove_store(hass, f"{key}.history_stats")
+
+    def _remove_journals():
+        for suffix in ("journal", "history"):
+            JsonLinesFile(hass.config.path(storage.STORAGE_DIR, f"{key}.{suffix}")).truncate()
+
+    await hass.async_add_executor_job(_remove_journals)
+    _LOGGER.info("Removed stored data of Microgreens site %s", entry.title)
+
+
 # --------------------------- Services ---------------------------
 
+# every service accepts one of these to pick the site; with a single site both may be omitted
+SERVICE_ROUTING = {
+    vol.Optional("entry_id"): str,
+    vol.Optional(CONF_SITE): str,
+}
+
 SERVICE_PROFILE_SCHEMA = vol.Schema({
     vol.Required("id"): str,
     vol.Required("name"): str,
@@ -398,6 +1038,7 @@ SERVICE_PROFILE_SCHEMA = vol.Schema({
     vol.Required("uncover_days"): vol.Coerce(int),
     vol.Optional("watering_frequency_days", default=1): vol.Coerce(int),
     vol.Optional("notes", default=""): str,
+    vol.Optional("watering_time"): str,  # HH:MM[:SS]; empty = global option, omitted = unchanged
 })
 
 SERVICE_DEPLOY_SCHEMA = vol.Schema({
@@ -412,35 +1053,82 @@ SERVICE_PLOT_SCHEMA = vol.Schema({
     vol.Optional("label"): str,
 })
 
+SERVICE_DEPLOY_MANY_SCHEMA = vol.Schema({
+    vol.Required("items"): vol.All([SERVICE_DEPLOY_SCHEMA], vol.Length(min=1)),
+})
+
+SERVICE_HARVEST_MANY_SCHEMA = vol.Schema({
+    vol.Required("plot_ids"): vol.All([str], vol.Length(min=1)),
+})
+
+SERVICE_PLOT_ADD_MANY_SCHEMA = vol.Schema({
+    vol.Required("items"): vol.All([SERVICE_PLOT_SCHEMA], vol.Length(min=1)),
+})
+
+SERVICE_HISTORY_SCHEMA = vol.Schema({
+    vol.Optional("records", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional("plot_id"): str,
+})
+
+SERVICE_AGENDA_SCHEMA = vol.Schema({
+    vol.Optional("start_date"): str,
+    vol.Optional("days", default=7): vol.All(vol.Coerce(int), vol.Range(min=1, max=366)),
+})
+
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    # services and websocket commands are domain-wide and resolve the runtime
+    # per call, so entry reloads never re-register them or keep old runtimes alive
+    _register_services(hass)
+    websocket.async_register(hass)
+    # nothing in the frontend is needed to bring the sites up; keep it off the startup path
+    async_at_started(hass, _async_setup_frontend)
     return True
 
-def _rt(hass: HomeAssistant) -> Runtime:
-    entry_id = next(iter(hass.data.get(DOMAIN, {})))
-    return hass.data[DOMAIN][entry_id]
-
-def _register_services(self: Runtime):
-    hass = self.hass if hasattr(self, "_hass") else self.hass  # whatever you already use
+def _rt(hass: HomeAssistant, call: ServiceCall) -> Runtime:
+    """Route a service call to its site's runtime (dict lookups only)."""
+    runtimes: dict[str, Runtime] = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get("entry_id")
+    if not entry_id and call.data.get(CONF_SITE):
+        entry_id = hass.data.get(KEY_SITES, {}).get(slugify(call.data[CONF_SITE]))
+        if entry_id is None:
+            raise vol.Invalid(f"unknown site {call.data[CONF_SITE]!r}")
+    if entry_id:
+        rt = runtimes.get(entry_id)
+        if rt is None:
+            raise vol.Invalid(f"unknown entry_id {entry_id!r}")
+        return rt
+    if len(runtimes) == 1:
+        return next(iter(runtimes.values()))
+    if not runtimes:
+        raise vol.Invalid("Microgreens is not set up")
+    raise vol.Invalid("several sites are configured; pass entry_id or site")
+
+def _register_services(hass: HomeAssistant):
 
     async def profile_upsert(call: ServiceCall):
         _LOGGER.debug("Service profile_upsert: %s", call.data)
-        await self.add_or_update_profile(dict(call.data))
+        rt = _rt(hass, call)
+        await rt.add_or_update_profile(dict(call.data))
 
     async def profile_delete(call: ServiceCall):
         _LOGGER.debug("Service profile_delete: %s", call.data)
-        await self.delete_profile(call.data["id"])
+        rt = _rt(hass, call)
+        await rt.delete_profile(call.data["id"])
 
     async def plot_add(call: ServiceCall):
         _LOGGER.debug("Service plot_add: %s", call.data)
-        await self.add_plot(call.data["plot_id"], call.data.get("label"))
+        rt = _rt(hass, call)
+        await rt.add_plot(call.data["plot_id"], call.data.get("label"))
 
     async def plot_remove(call: ServiceCall):
         _LOGGER.debug("Service plot_remove: %s", call.data)
-        await self.remove_plot(call.data["plot_id"])
+        rt = _rt(hass, call)
+        await rt.remove_plot(call.data["plot_id"])
 
     async def deploy(call: ServiceCall):
         _LOGGER.debug("Service deploy: %s", call.data)
-        await self.deploy(
+        rt = _rt(hass, call)
+        await rt.deploy(
             call.data["plot_id"], call.data["profile_id"],
             call.data["start_date"], call.data.get("sticker")
         )
@@ -454,59 +1142,131 @@ def _register_services(self: Runtime):
 
     async def harvest(call: ServiceCall):
         _LOGGER.debug("Service harvest: %s", call.data)
-        await self.harvest(call.data["plot_id"])
+        rt = _rt(hass, call)
+        await rt.harvest(call.data["plot_id"])
 
     async def unassign(call: ServiceCall):
         _LOGGER.debug("Service unassign: %s", call.data)
-        await self.unassign(call.data["plot_id"])
-
-    hass.services.async_register(DOMAIN, "profile_upsert", profile_upsert, schema=SERVICE_PROFILE_SCHEMA)
-    hass.services.async_register(DOMAIN, "profile_delete", profile_delete, schema=vol.Schema({vol.Required("id"): str}))
-    hass.services.async_register(DOMAIN, "plot_add", plot_add, schema=SERVICE_PLOT_SCHEMA)
-    hass.services.async_register(DOMAIN, "plot_remove", plot_remove, schema=vol.Schema({vol.Required("plot_id"): str}))
-    hass.services.async_register(DOMAIN, "deploy", deploy, schema=SERVICE_DEPLOY_SCHEMA)
-    hass.services.async_register(DOMAIN, "harvest", harvest, schema=vol.Schema({vol.Required("plot_id"): str}))
-    hass.services.async_register(DOMAIN, "unassign", unassign, schema=vol.Schema({vol.Required("plot_id"): str}))
+        rt = _rt(hass, call)
+        await rt.unassign(call.data["plot_id"])
+
+    hass.services.async_register(DOMAIN, "profile_upsert", profile_upsert, schema=SERVICE_PROFILE_SCHEMA.extend(SERVICE_ROUTING))
+    hass.services.async_register(DOMAIN, "profile_delete", profile_delete, schema=vol.Schema({**SERVICE_ROUTING, vol.Required("id"): str}))
+    hass.services.async_register(DOMAIN, "plot_add", plot_add, schema=SERVICE_PLOT_SCHEMA.extend(SERVICE_ROUTING))
+    hass.services.async_register(DOMAIN, "plot_remove", plot_remove, schema=vol.Schema({**SERVICE_ROUTING, vol.Required("plot_id"): str}))
+    hass.services.async_register(DOMAIN, "deploy", deploy, schema=SERVICE_DEPLOY_SCHEMA.extend(SERVICE_ROUTING))
+    hass.services.async_register(DOMAIN, "harvest", harvest, schema=vol.Schema({**SERVICE_ROUTING, vol.Required("plot_id"): str}))
+    hass.services.async_register(DOMAIN, "unassign", unassign, schema=vol.Schema({**SERVICE_ROUTING, vol.Required("plot_id"): str}))
     hass.services.async_register(DOMAIN, "reinstall_frontend", _svc_reinstall_frontend)
 
+    async def deploy_many(call: ServiceCall) -> ServiceResponse:
+        _LOGGER.debug("Service deploy_many: %d items", len(call.data["items"]))
+        rt = _rt(hass, call)
+        return {"results": await rt.deploy_many(call.data["items"])}
+
+    async def harvest_many(call: ServiceCall) -> ServiceResponse:
+        _LOGGER.debug("Service harvest_many: %s", call.data)
+        rt = _rt(hass, call)
+        return {"results": await rt.harvest_many(call.data["plot_ids"])}
+
+    async def plot_add_many(call: ServiceCall) -> ServiceResponse:
+        _LOGGER.debug("Service plot_add_many: %d items", len(call.data["items"]))
+        rt = _rt(hass, call)
+        return {"results": await rt.add_plots(call.data["items"])}
+
+    hass.services.async_register(
+        DOMAIN, "deploy_many", deploy_many,
+        schema=SERVICE_DEPLOY_MANY_SCHEMA.extend(SERVICE_ROUTING), supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, "harvest_many", harvest_many,
+        schema=SERVICE_HARVEST_MANY_SCHEMA.extend(SERVICE_ROUTING), supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, "plot_add_many", plot_add_many,
+        schema=SERVICE_PLOT_ADD_MANY_SCHEMA.extend(SERVICE_ROUTING), supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def history(call: ServiceCall) -> ServiceResponse:
+        _LOGGER.debug("Service history: %s", call.data)
+        rt = _rt(hass, call)
+        resp = rt.history.summary(dt_util.now().date())
+        if call.data.get("records"):
+            resp["records"] = await rt.history.async_records(call.data["records"], call.data.get("plot_id"))
+        return resp
+
+    hass.services.async_register(
+        DOMAIN, "history", history,
+        schema=SERVICE_HISTORY_SCHEMA.extend(SERVICE_ROUTING), supports_response=SupportsResponse.ONLY,
+    )
+
+    async def agenda(call: ServiceCall) -> ServiceResponse:
+        _LOGGER.debug("Service agenda: %s", call.data)
+        rt = _rt(hass, call)
+        try:
+            start = date.fromisoformat(call.data["start_date"]) if "start_date" in call.data else dt_util.now().date()
+        except ValueError as err:
+            raise vol.Invalid(f"invalid start_date {call.data['start_date']!r}") from err
+        end = start + timedelta(days=call.data["days"] - 1)
+        return {"start_date": start.isoformat(), "end_date": end.isoformat(), "days": rt.agenda_between(start, end)}
+
+    hass.services.async_register(
+        DOMAIN, "agenda", agenda,
+        schema=SERVICE_AGENDA_SCHEMA.extend(SERVICE_ROUTING), supports_response=SupportsResponse.ONLY,
+    )
+
     async def shift_schedule(call):
-        from datetime import date as _date, timedelta
-        pid = call.data["plot_id"]; delta = int(call.data["days"])
-        d = next((x for x in self.data.deployments if x.plot_id == pid), None)
-        if not d:
-            return
-        def sh(v): return (_date.fromisoformat(v) + timedelta(days=delta)).isoformat()
-        d.start_date = sh(d.start_date)
-        d.cover_end = sh(d.cover_end)
-        d.harvest_date = sh(d.harvest_date)
-        d.next_watering_due = sh(d.next_watering_due)
-        await self._save_and_broadcast()
+        rt = _rt(hass, call)
+        pid = call.data["plot_id"]; shift = timedelta(days=int(call.data["days"]))
+
+        def apply():
+            d = rt.data.deployments.get(pid)
+            if not d:
+                return
+            d.start_date += shift
+            d.cover_end += shift
+            d.harvest_date += shift
+            d.next_watering_due += shift
+            rt._put_deployment(d, op="shift")
+
+        await rt._mutate(apply)
 
     hass.services.async_register(
         DOMAIN, "shift_schedule", shift_schedule,
-        schema=vol.Schema({vol.Required("plot_id"): str, vol.Required("days"): vol.Coerce(int)})
+        schema=vol.Schema({**SERVICE_ROUTING, vol.Required("plot_id"): str, vol.Required("days"): vol.Coerce(int)})
     )
 
 
     async def seed_defaults(call: ServiceCall):
-        await self.async_load()  # will fill any missing defaults
-        await self._save_and_broadcast()
-    hass.services.async_register(DOMAIN, "seed_defaults", seed_defaults)
+        rt = _rt(hass, call)
+
+        def apply() -> list[str]:
+            before = set(rt.data.plots)
+            rt._seed_defaults()  # fills any missing defaults
+            return [pid for pid in rt.data.plots if pid not in before]
+
+        added = await rt._mutate(apply)
+        if added:
+            # sensors for seeded plots, as plot_add_many does
+            dispatcher.async_dispatcher_send(hass, rt.signal(SIGNAL_NEW_PLOT), added)
+    hass.services.async_register(DOMAIN, "seed_defaults", seed_defaults, schema=vol.Schema(SERVICE_ROUTING))
 
 
     async def plot_rename(call: ServiceCall):
+        rt = _rt(hass, call)
         pid = call.data["plot_id"]; label = call.data["label"]
-        for p in self.data.plots:
-            if p.id == pid: p.label = label
+
+        def apply():
+            p = rt.data.plots.get(pid)
+            if p:
+                p.label = label
+                rt._put_plot(p, op="rename")
+
+        await rt._mutate(apply)
         _LOGGER.info("Renamed plot %s -> %s", pid, label)
-        await self._save_and_broadcast()
 
-    hass.services.async_register(DOMAIN, "shift_schedule", shift_schedule, schema=vol.Schema({
-        vol.Required("plot_id"): str, vol.Required("days"): vol.Coerce(int)
-    }))
     hass.services.async_register(DOMAIN, "plot_rename", plot_rename, schema=vol.Schema({
+        **SERVICE_ROUTING,
         vol.Required("plot_id"): str, vol.Required("label"): str
     }))
 
-
-Runtime._register_services = _register_services
@@ -0,0 +1,66 @@
+"""Date-bucketed index of upcoming plot events.
+
+Each day maps to the plots that uncover, are ready to harvest, or are due
+for watering on it. A deployment's entries are replaced whenever it is put
+again and dropped when it is removed. The daily summary and the agenda
+service then read single days instead of walking every deployment.
+
+Waterings are expanded from `next_watering_due` up to the harvest day, so a
+range query sees every reminder still ahead of a plot, not just the next one.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import date, timedelta
+
+KINDS: tuple[str, ...] = ("uncover", "harvest", "watering")
+
+
+class AgendaIndex:
+    def __init__(self):
+        self._days: dict[date, dict[str, set[str]]] = {}
+        self._entries: dict[str, list[tuple[date, str]]] = {}  # plot_id -> what it added
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def days(self) -> int:
+        """Days with at least one entry."""
+        return len(self._days)
+
+    def put(self, dep) -> None:
+        """(Re)index one deployment."""
+        self.remove(dep.plot_id)
+        entries = [(dep.cover_end, "uncover"), (dep.harvest_date, "harvest")]
+        step = timedelta(days=max(1, dep.watering_every_days))
+        day = dep.next_watering_due
+        while day <= dep.harvest_date:
+            entries.append((day, "watering"))
+            day += step
+        for day, kind in entries:
+            self._days.setdefault(day, {}).setdefault(kind, set()).add(dep.plot_id)
+        self._entries[dep.plot_id] = entries
+
+    def remove(self, plot_id: str) -> None:
+        for day, kind in self._entries.pop(plot_id, ()):
+            bucket = self._days[day]
+            plots = bucket[kind]
+            plots.discard(plot_id)
+            if not plots:
+                del bucket[kind]
+                if not bucket:
+                    del self._days[day]
+
+    def on(self, day: date) -> dict[str, set[str]]:
+        """{kind: plot_ids} for one day; kinds without plots are absent. Do not mutate."""
+        return self._days.get(day, {})
+
+    def between(self, start: date, end: date) -> Iterator[tuple[date, dict[str, set[str]]]]:
+        """Days in [start, end] that have anything on them, in order."""
+        day = start
+        while day <= end:
+            bucket = self._days.get(day)
+            if bucket:
+                yield day, bucket
+            day += timedelta(days=1)
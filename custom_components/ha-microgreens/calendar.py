@@ -4,68 +4,130 @@ import homeassistant.util.dt as dt_util
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DOMAIN, SIGNAL_DATA_UPDATED
+from .const import DOMAIN, SIGNAL_CALENDAR_UPDATED
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     rt = hass.data[DOMAIN][entry.entry_id]
     async_add_entities([MicrogreensCalendar(rt)])
 
+
+def _day_bounds(start: datetime, end: datetime, tz) -> tuple[int, int]:
+    """Map an aware [start, end) window to the day-ordinal window of all-day events it overlaps."""
+    lo = start.astimezone(tz).date().toordinal()
+    e = end.astimezone(tz)
+    hi = e.date().toordinal() + (0 if e.time() == datetime.min.time() else 1)
+    return lo, hi
+
+
 class MicrogreensCalendar(CalendarEntity):
-    _attr_name = "Microgreens"
-    _attr_unique_id = "microgreens_calendar"
+    """All-day phase events per deployment: cover span, uncover day, harvest day, waterings.
+
+    Cover/uncover/harvest events are built once per deployment and cached;
+    watering occurrences are expanded from the recurrence only for the
+    requested window and never stored.
+    """
     _attr_icon = "mdi:calendar-range"
 
     def __init__(self, rt):
         self._rt = rt
-        self._unsub = None
+        self._attr_name = rt.entity_prefix
+        self._attr_unique_id = f"{rt.entry.entry_id}_calendar"
+        # fixed phase events by plot_id; dropped per plot when its deployment changes
+        self._events: dict[str, list[CalendarEvent]] = {}
 
     @property
     def device_info(self) -> DeviceInfo:
         return DeviceInfo(
             identifiers={(DOMAIN, self._rt.entry.entry_id)},
-            name="Microgreens Manager",
+            name=self._rt.device_name,
             manufacturer="Custom",
         )
 
+    def _summary(self, phase: str, d) -> str:
+        return f"{self._rt.title_prefix} {phase}: {d.plant_name} @ {d.plot_id}"
+
+    def _phase_events(self, plot_id: str) -> list[CalendarEvent]:
+        evs = self._events.get(plot_id)
+        if evs is None:
+            d = self._rt.data.deployments[plot_id]
+            sd, ce, hv = d.start_date, d.cover_end, d.harvest_date
+            desc = f"Start: {d.start_date}\nCovered until: {d.cover_end}\nHarvest: {d.harvest_date}\nSticker: {d.sticker}\n{d.notes or ''}".strip()
+            one = timedelta(days=1)
+            evs = []
+            if ce > sd:
+                evs.append(CalendarEvent(summary=self._summary("Cover", d), start=sd, end=ce, description=desc))
+            evs.append(CalendarEvent(summary=self._summary("Uncover", d), start=ce, end=ce + one, description=desc))
+            evs.append(CalendarEvent(summary=self._summary("Harvest", d), start=hv, end=hv + one, description=desc))
+            self._events[plot_id] = evs
+        return evs
+
+    def _waterings(self, plot_id: str, lo: int, hi: int):
+        """Watering occurrences in [lo, hi) day ordinals, up to and including harvest day.
+
+        The series is anchored at the deployment's start, not at
+        `next_watering_due`, which moves forward after every reminder and
+        would erase the waterings already past.
+        """
+        d = self._rt.data.deployments[plot_id]
+        step = max(1, d.watering_every_days)
+        first = d.start_date.toordinal() + step
+        last = d.harvest_date.toordinal()
+        day = max(lo, first)
+        day += -(day - first) % step  # round up onto the recurrence
+        summary = self._summary("Water", d)
+        while day < hi and day <= last:
+            start = _date.fromordinal(day)
+            yield CalendarEvent(summary=summary, start=start, end=start + timedelta(days=1), description=f"Sticker: {d.sticker}")
+            day += step
+
+    def _window(self, plot_id: str, lo: int, hi: int) -> list[CalendarEvent]:
+        lo_d, hi_d = _date.fromordinal(lo), _date.fromordinal(hi)
+        out = [ev for ev in self._phase_events(plot_id) if ev.start < hi_d and ev.end > lo_d]
+        out.extend(self._waterings(plot_id, lo, hi))
+        return out
+
     @property
     def event(self):
         """Next upcoming event (optional)."""
         tz = dt_util.get_time_zone(self._rt.hass.config.time_zone)
-        now = dt_util.now().astimezone(tz)
-        candidates = []
-        for d in self._rt.data.deployments:
-            s = datetime.combine(_date.fromisoformat(d.start_date), datetime.min.time(), tzinfo=tz)
-            e = datetime.combine(_date.fromisoformat(d.harvest_date) + timedelta(days=1), datetime.min.time(), tzinfo=tz)
-            if e >= now:
-                candidates.append((s, e, d))
-        if not candidates:
-            return None
-        s, e, d = sorted(candidates, key=lambda x: x[0])[0]
-        return CalendarEvent(summary=f"{self._rt.title_prefix} {d.plant_name} @ {d.plot_id}", start=s, end=e, description=d.notes)
+        today = dt_util.now().astimezone(tz).date().toordinal()
+        best = None
+        # deployments come back ordered by start and none of a deployment's
+        # events start before it does, so stop once no later one can win
+        for plot_id, start, end in self._rt.intervals.overlapping(today, float("inf")):
+            if best is not None and start > best.start.toordinal():
+                break
+            for ev in self._phase_events(plot_id):
+                if ev.end.toordinal() > today and (best is None or ev.start < best.start):
+                    best = ev
+            nxt = next(self._waterings(plot_id, today, end), None)
+            if nxt and (best is None or nxt.start < best.start):
+                best = nxt
+        return best
 
     async def async_get_events(self, hass, start_date, end_date):
         """Return events between start_date and end_date (datetime aware)."""
+        t0 = self._rt.metrics.clock()
         tz = dt_util.get_time_zone(hass.config.time_zone)
+        lo, hi = _day_bounds(start_date, end_date, tz)
         events = []
-        for d in self._rt.data.deployments:
-            s = datetime.combine(_date.fromisoformat(d.start_date), datetime.min.time(), tzinfo=tz)
-            e = datetime.combine(_date.fromisoformat(d.harvest_date) + timedelta(days=1), datetime.min.time(), tzinfo=tz)
-            if e <= start_date or s >= end_date:
-                continue
-            summary = f"{self._rt.title_prefix} {d.plant_name} @ {d.plot_id}"
-            desc = f"Start: {d.start_date}\nCovered until: {d.cover_end}\nHarvest: {d.harvest_date}\nSticker: {d.sticker}\n{d.notes or ''}".strip()
-            events.append(CalendarEvent(summary=summary, start=s, end=e, description=desc))
+        for plot_id, _s, _e in self._rt.intervals.overlapping(lo, hi):
+            events.extend(self._window(plot_id, lo, hi))
+        self._rt.metrics.timed("calendar_query", t0, events=len(events))
         return events
 
     async def async_added_to_hass(self):
-        self._unsub = async_dispatcher_connect(self.hass, SIGNAL_DATA_UPDATED, self._update)
-        self.async_on_remove(self._unsub)
+        self.async_on_remove(async_dispatcher_connect(
+            self.hass, self._rt.signal(SIGNAL_CALENDAR_UPDATED), self._changed
+        ))
 
-    def _update(self):
-        # Use thread-safe scheduling to update state from signal callbacks
-        # to avoid calling async_write_ha_state from non-loop threads.
-        self.schedule_update_ha_state()
+    @callback
+    def _changed(self, plot_ids: set[str]):
+        for plot_id in plot_ids:
+            self._events.pop(plot_id, None)
+        self._rt.metrics.count("state_writes")
+        self.async_write_ha_state()
@@ -8,11 +8,12 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant import config_entries
 from homeassistant.helpers.selector import selector
 from homeassistant.config_entries import ConfigEntry, OptionsFlow
+from homeassistant.util import slugify
 
 from .const import (
-    DOMAIN,
+    DOMAIN, CONF_SITE, CONF_DEBUG_METRICS,
     DEFAULT_CALENDAR, DEFAULT_NOTIFY, DEFAULT_TITLE_PREFIX,
-    DEFAULT_WATERING_TIME, DEFAULT_SUMMARY_TIME,
+    DEFAULT_WATERING_TIME, DEFAULT_SUMMARY_TIME, DEFAULT_SAVE_DELAY,
 )
 
 def _notify_choices(hass: HomeAssistant) -> list[str]:
@@ -23,16 +24,34 @@ def _calendar_choices(hass: HomeAssistant) -> list[str]:
     return sorted([s.entity_id for s in hass.states.async_all("calendar")])
 
 class MicrogreensConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
-    """Create single instance; settings are in Options (gear)."""
+    """One entry per site (grow room); settings are in Options (gear)."""
     VERSION = 1
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None):
-        if self._async_current_entries():
-            return self.async_abort(reason="single_instance_allowed")
-        return self.async_create_entry(title="Microgreens", data={})
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            site = user_input[CONF_SITE].strip()
+            slug = slugify(site)
+            # entries from before multi-site support have no site and go by their title
+            taken = {slugify(e.data.get(CONF_SITE) or e.title) for e in self._async_current_entries()}
+            if not slug:
+                errors[CONF_SITE] = "invalid_site"
+            elif slug in taken:
+                errors[CONF_SITE] = "site_exists"
+            else:
+                await self.async_set_unique_id(slug)
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(title=site, data={CONF_SITE: site})
+
+        default = "" if self._async_current_entries() else "Microgreens"
+        return self.async_show_form(
+            step_id="user",
+            data_schema=vol.Schema({vol.Required(CONF_SITE, default=default): str}),
+            errors=errors,
+        )
 
     async def async_step_import(self, user_input):
-        return await self.async_step_user(user_input)
+        return await self.async_step_user({CONF_SITE: (user_input or {}).get(CONF_SITE, "Microgreens")})
 
     @staticmethod
     @callback
@@ -53,6 +72,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         o.setdefault("title_prefix",    DEFAULT_TITLE_PREFIX)
         o.setdefault("watering_time",   DEFAULT_WATERING_TIME)  # "HH:MM[:SS]"
         o.setdefault("summary_time",    DEFAULT_SUMMARY_TIME)
+        o.setdefault("save_delay",      DEFAULT_SAVE_DELAY)
+        o.setdefault(CONF_DEBUG_METRICS, False)
         return o
 
     async def async_step_init(self, user_input: dict[str, Any] | None = None):
@@ -75,6 +96,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 "title_prefix":    user_input["title_prefix"],
                 "watering_time":   _to_hms(user_input["watering_time"]),
                 "summary_time":    _to_hms(user_input["summary_time"]),
+                "save_delay":      int(user_input["save_delay"]),
+                CONF_DEBUG_METRICS: bool(user_input.get(CONF_DEBUG_METRICS, False)),
             }
             return self.async_create_entry(title="", data=data)
 
@@ -96,5 +119,9 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 selector({"time": {}}),
             vol.Required("summary_time",    default=cur["summary_time"]):
                 selector({"time": {}}),
+            vol.Required("save_delay",      default=cur["save_delay"]):
+                selector({"number": {"min": 0, "max": 60, "step": 1, "unit_of_measurement": "s", "mode": "box"}}),
+            vol.Optional(CONF_DEBUG_METRICS, default=cur[CONF_DEBUG_METRICS]):
+                selector({"boolean": {}}),
         })
         return self.async_show_form(step_id="init", data_schema=schema)
@@ -1,11 +1,19 @@
 DOMAIN = "microgreens"
-STORAGE_VERSION = 1
+STORAGE_VERSION = 2  # v2: compacted snapshot + append-only journal
 STORAGE_KEY = DOMAIN
+JOURNAL_COMPACT_THRESHOLD = 500  # journal entries before the snapshot is rewritten
 
-SIGNAL_DATA_UPDATED = f"{DOMAIN}_data_updated"
-SIGNAL_NEW_PLOT = f"{DOMAIN}_new_plot"
-SIGNAL_REMOVE_PLOT = f"{DOMAIN}_remove_plot"
+# dispatcher signals are scoped per config entry: .format(entry_id[, plot_id])
+SIGNAL_PLOT_UPDATED = f"{DOMAIN}_plot_updated_{{}}_{{}}"
+SIGNAL_META_UPDATED = f"{DOMAIN}_meta_updated_{{}}"
+SIGNAL_CALENDAR_UPDATED = f"{DOMAIN}_calendar_updated_{{}}"
+SIGNAL_NEW_PLOT = f"{DOMAIN}_new_plot_{{}}"
+SIGNAL_REMOVE_PLOT = f"{DOMAIN}_remove_plot_{{}}"
 KEY_FRONTEND_BASE = f"{DOMAIN}_frontend_base"
+KEY_SITES = f"{DOMAIN}_sites"  # site slug -> entry_id, for service routing
+
+CONF_SITE = "site"
+CONF_DEBUG_METRICS = "debug_metrics"  # option: hot-path counters, diagnostics sensor
 
 
 DEFAULT_TITLE_PREFIX = "[Microgreens]"
@@ -13,3 +21,5 @@ DEFAULT_CALENDAR = "calendar.microgreens"
 DEFAULT_NOTIFY = "notify.notify"
 DEFAULT_WATERING_TIME = "09:30:00"  # HH:MM:SS
 DEFAULT_SUMMARY_TIME = "08:30:00"
+DEFAULT_SAVE_DELAY = 2  # seconds; 0 writes every change immediately
+WATERING_RETRY_MINUTES = 60  # a reminder whose notification failed is retried this much later
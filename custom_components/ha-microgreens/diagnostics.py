@@ -0,0 +1,30 @@
+"""Diagnostics download for a Microgreens site."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Model sizes, queue and registration counts, setup timing and hot-path metrics.
+
+    No plot or profile contents are included; the counters under "metrics"
+    are only filled while the debug_metrics option is on.
+    """
+    rt = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "site": rt.site,
+        "legacy": rt.legacy,
+        "options": dict(entry.options),
+        "meta_revision": rt.meta_revision,
+        "history": {
+            "cycles": rt.history.stats["cycles"],
+            "profiles": len(rt.history.stats["profiles"]),
+            "plots": len(rt.history.stats["plots"]),
+        },
+        **rt.debug_info(),
+    }
@@ -2,11 +2,21 @@
 """Microgreens cards registration and deploy to /local."""
 from __future__ import annotations
 
+import gzip
+import hashlib
 import logging
-import shutil
+from dataclasses import dataclass
 from pathlib import Path
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
 from homeassistant.core import HomeAssistant
 
+try:  # optional; .br files shipped next to the cards are used either way
+    import brotli
+except ImportError:  # pragma: no cover - depends on the HA install
+    brotli = None
+
 _LOGGER = logging.getLogger(__name__)
 
 LOCAL_SUBDIR = "ha-microgreens"
@@ -15,122 +25,183 @@ CARDS: tuple[str, ...] = (
     "microgreens-plot-card.js",
 )
 
-_VERSION = "1"
+_VIEW_FLAG = "microgreens_cards_view_registered"
+_ASSETS = "microgreens_card_assets"
 
+# The ?v= query is the file's content hash, so a URL never changes meaning.
+_CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+_CACHE_REVALIDATE = "no-cache"
 
-def _register_static_path(hass: HomeAssistant, url_path: str, path: str) -> None:
-    """Register a static path in a HA-version-compatible way.
 
-    We serve cards directly from the integration package `frontend/` folder instead
-    of copying them into `/config/www`.
-    """
+@dataclass(slots=True, frozen=True)
+class CardAsset:
+    version: str
+    raw: bytes
+    gzip: bytes | None
+    br: bytes | None
+
+
+def _variant(src: Path, suffix: str) -> bytes | None:
+    """A pre-compressed sibling (name.js.gz / name.js.br) not older than the source."""
+    path = src.with_name(src.name + suffix)
     try:
-        from homeassistant.components.http import StaticPathConfig
-
-        if hasattr(hass.http, "async_register_static_paths"):
-            hass.async_create_task(
-                hass.http.async_register_static_paths(
-                    [StaticPathConfig(url_path, path, True)]
-                )
-            )
-            return
-    except Exception:
+        if path.stat().st_mtime >= src.stat().st_mtime:
+            return path.read_bytes()
+    except OSError:
         pass
+    return None
 
-    try:
-        hass.http.register_static_path(url_path, path, cache_headers=True)
-    except Exception:
-        _LOGGER.debug("Failed to register static path %s -> %s", url_path, path)
+
+def _load_assets(paths: dict[str, Path]) -> dict[str, CardAsset]:
+    """Read, hash and compress every card (blocking; run in the executor)."""
+    assets = {}
+    for name, src in paths.items():
+        raw = src.read_bytes()
+        gz = _variant(src, ".gz") or gzip.compress(raw, 9, mtime=0)
+        br = _variant(src, ".br")
+        if br is None and brotli is not None:
+            br = brotli.compress(raw)
+        assets[name] = CardAsset(hashlib.sha256(raw).hexdigest()[:12], raw, gz, br)
+    return assets
 
 
-async def _init_resource(hass: HomeAssistant, url: str, ver: str) -> bool:
+class MicrogreensCardView(HomeAssistantView):
+    """Serve the cards from memory, pre-compressed, cached for as long as the hash holds.
+
+    Requests carrying the current `?v=` hash get an immutable response; any
+    other URL (bare or stale hash) must revalidate against the ETag.
+    """
+
+    url = f"/{LOCAL_SUBDIR}/{{name}}"
+    name = "microgreens:cards"
+    requires_auth = False
+
+    def __init__(self, assets: dict[str, CardAsset]) -> None:
+        self._assets = assets  # shared with hass.data; reinstall_frontend refreshes it in place
+
+    async def get(self, request: web.Request, name: str) -> web.Response:
+        asset = self._assets.get(name)
+        if asset is None:
+            raise web.HTTPNotFound()
+        headers = {
+            "Cache-Control": _CACHE_IMMUTABLE if request.query.get("v") == asset.version else _CACHE_REVALIDATE,
+            "ETag": f'"{asset.version}"',
+            "Vary": "Accept-Encoding",
+        }
+        if request.headers.get("If-None-Match") == headers["ETag"]:
+            return web.Response(status=304, headers=headers)
+
+        accept = request.headers.get("Accept-Encoding", "")
+        body = asset.raw
+        for encoding, variant in (("br", asset.br), ("gzip", asset.gzip)):
+            if variant is not None and encoding in accept:
+                headers["Content-Encoding"] = encoding
+                body = variant
+                break
+        return web.Response(body=body, headers=headers, content_type="application/javascript", charset="utf-8")
+
+
+def _remove_old_copies(www_dir: Path) -> None:
+    """Delete /config/www copies left by old releases (blocking; run in the executor)."""
+    for name in CARDS:
+        dst = www_dir / name
+        if dst.exists():
+            try:
+                dst.unlink()
+                _LOGGER.info("Removed old /config/www copy: %s", dst)
+            except Exception as exc:
+                _LOGGER.debug("Failed to remove old /config/www copy %s: %s", dst, exc)
+
+
+async def _async_resources(hass: HomeAssistant):
+    """(Lovelace resource collection, storage mode?) or None when Lovelace isn't available."""
     try:
-        from homeassistant.components.frontend import add_extra_js_url
         from homeassistant.components.lovelace.resources import ResourceStorageCollection
     except Exception:
-        _LOGGER.debug("Lovelace helpers unavailable; skipping resource init")
-        return False
+        _LOGGER.debug("Lovelace helpers unavailable")
+        return None
 
     lovelace = hass.data.get("lovelace")
     if not lovelace:
-        _LOGGER.debug("Lovelace storage not available; skipping resource init")
-        return False
+        _LOGGER.debug("Lovelace storage not available")
+        return None
 
     resources: ResourceStorageCollection = (
         lovelace.resources if hasattr(lovelace, "resources") else lovelace["resources"]
     )
-
     await resources.async_get_info()
+    return resources, isinstance(resources, ResourceStorageCollection)
 
-    url2 = f"{url}?v={ver}"
-
-    for item in resources.async_items():
-        if not item.get("url", "").startswith(url):
-            continue
-        if item["url"].endswith(ver):
-            return False
-        _LOGGER.debug("Update lovelace resource to: %s", url2)
-        if isinstance(resources, ResourceStorageCollection):
-            await resources.async_update_item(item["id"], {"res_type": "module", "url": url2})
-        else:
-            item["url"] = url2
-        return True
-
-    if isinstance(resources, ResourceStorageCollection):
-        _LOGGER.debug("Add new lovelace resource: %s", url2)
-        await resources.async_create_item({"res_type": "module", "url": url2})
-    else:
-        _LOGGER.debug("Add extra JS module: %s", url2)
-        add_extra_js_url(hass, url2)
-
-    return True
 
+async def _async_sync_resources(hass: HomeAssistant, versions: dict[str, str]) -> int:
+    """Bring the Lovelace resources in line with CARDS in a single pass.
 
-async def _migrate_local_resources(
-    hass: HomeAssistant, local_prefix: str, new_url: str, ver: str
-) -> int:
+    One walk over the collection handles stale versions of our URLs,
+    `/local/ha-microgreens/` URLs from older releases and base-only entries
+    (e.g. "/ha-microgreens/?v=1"); cards still missing afterwards are
+    added. Returns the number of resources changed.
+    """
     try:
-        from homeassistant.components.lovelace.resources import ResourceStorageCollection
+        from homeassistant.components.frontend import add_extra_js_url
     except Exception:
-        _LOGGER.debug("Lovelace helpers unavailable; skipping local -> integration migration")
+        _LOGGER.debug("Frontend helpers unavailable; skipping resource sync")
         return 0
-
-    lovelace = hass.data.get("lovelace")
-    if not lovelace:
-        _LOGGER.debug("Lovelace storage not available; skipping migration")
+    found = await _async_resources(hass)
+    if found is None:
         return 0
+    resources, storage_mode = found
 
-    resources: ResourceStorageCollection = (
-        lovelace.resources if hasattr(lovelace, "resources") else lovelace["resources"]
-    )
-
-    await resources.async_get_info()
-
-    migrated = 0
+    base = f"/{LOCAL_SUBDIR}/"
+    legacy = f"/local/{LOCAL_SUBDIR}/"
+    want = {name: f"{base}{name}?v={versions[name]}" for name in CARDS}
+    present: set[str] = set()
+    base_only: list[dict] = []
+    changed = 0
 
     for item in list(resources.async_items()):
-        u = item.get("url", "")
-        if not u.startswith(local_prefix):
+        url = item.get("url", "")
+        path = url.split("?", 1)[0]
+        if path.startswith(legacy):
+            path = base + path[len(legacy):]
+        elif not path.startswith(base):
             continue
-
-        suffix = u[len(local_prefix) :]
-        if not suffix:
+        name = path[len(base):]
+        if not name:
+            base_only.append(item)  # reused below for a card that is still missing
+            continue
+        if name not in want or name in present:
             continue
+        present.add(name)
+        if url != want[name]:
+            changed += await _set_url(resources, storage_mode, item, want[name])
 
-        new_base = new_url.rstrip("/")
-        url2 = f"{new_base}/{suffix}?v={ver}"
+    for name in CARDS:
+        if name in present:
+            continue
+        if base_only:
+            changed += await _set_url(resources, storage_mode, base_only.pop(), want[name])
+            continue
+        if storage_mode:
+            _LOGGER.debug("Add new lovelace resource: %s", want[name])
+            await resources.async_create_item({"res_type": "module", "url": want[name]})
+        else:
+            _LOGGER.debug("Add extra JS module: %s", want[name])
+            add_extra_js_url(hass, want[name])
+        changed += 1
+    return changed
 
-        _LOGGER.info("Migrating Lovelace resource from %s to %s", u, url2)
-        try:
-            if isinstance(resources, ResourceStorageCollection):
-                await resources.async_update_item(item["id"], {"res_type": "module", "url": url2})
-            else:
-                item["url"] = url2
-            migrated += 1
-        except Exception as exc:
-            _LOGGER.warning("Failed to migrate resource %s -> %s: %s", u, url2, exc)
 
-    return migrated
+async def _set_url(resources, storage_mode: bool, item: dict, url: str) -> int:
+    _LOGGER.info("Updating Lovelace resource %s -> %s", item.get("url"), url)
+    try:
+        if storage_mode:
+            await resources.async_update_item(item["id"], {"res_type": "module", "url": url})
+        else:
+            item["url"] = url
+        return 1
+    except Exception as exc:
+        _LOGGER.warning("Failed to update Lovelace resource %s: %s", item.get("url"), exc)
+        return 0
 
 
 class MicrogreensCardRegistration:
@@ -143,120 +214,59 @@ class MicrogreensCardRegistration:
         return Path(__file__).parent / "frontend" / name
 
     async def async_register(self) -> None:
-        card_list = []
+        """Hash the cards, (re)publish them and point the Lovelace resources at the new hashes."""
+        paths = {}
         for name in CARDS:
-            src = self._src_path(name)
             www_path = Path(__file__).parent / "www" / name
-            if www_path.exists():
-                serve_path = str(www_path)
-            else:
-                serve_path = str(src)
-
-            url = f"/{LOCAL_SUBDIR}/{name}"
-            _register_static_path(self.hass, url, serve_path)
-            card_list.append(url)
+            paths[name] = www_path if www_path.exists() else self._src_path(name)
+        loaded = await self.hass.async_add_executor_job(_load_assets, paths)
 
-        card_list_str = ", ".join(card_list)
-
-        # Attempt delicate auto-registration of the lovelace resource for each card
-        for url in card_list:
-            try:
-                await _init_resource(self.hass, url, _VERSION)
-                _LOGGER.debug("Auto-registered lovelace resource for %s", url)
-            except Exception:
-                _LOGGER.debug("Auto-registration failed for %s", url)
-
-        # Remove old /config/www copies if present
-        try:
-            for name in CARDS:
-                dst = Path(self.hass.config.path("www")) / LOCAL_SUBDIR / name
-                if dst.exists():
-                    try:
-                        dst.unlink()
-                        _LOGGER.info("Removed old /config/www copy: %s", dst)
-                    except Exception as exc:
-                        _LOGGER.debug("Failed to remove old /config/www copy %s: %s", dst, exc)
-        except Exception:
-            _LOGGER.debug("Could not determine config www path to cleanup old microgreens cards")
+        assets = self.hass.data.setdefault(_ASSETS, {})
+        assets.update(loaded)
+        if not self.hass.data.get(_VIEW_FLAG):
+            # views cannot be removed again; later calls only refresh `assets`
+            self.hass.http.register_view(MicrogreensCardView(assets))
+            self.hass.data[_VIEW_FLAG] = True
 
-        # Migrate any lovelace resources that still point to /local/
+        versions = {name: asset.version for name, asset in loaded.items()}
         try:
-            migrated = await _migrate_local_resources(
-                self.hass, f"/local/{LOCAL_SUBDIR}/", f"/{LOCAL_SUBDIR}/", _VERSION
-            )
-            if migrated:
-                _LOGGER.info("Migrated %d Microgreens Lovelace /local/ resources to integration-hosted URLs", migrated)
+            changed = await _async_sync_resources(self.hass, versions)
+            if changed:
+                _LOGGER.info("Updated %d Microgreens Lovelace resources", changed)
         except Exception:
-            _LOGGER.debug("Local-to-integration resource migration failed for microgreens")
+            _LOGGER.debug("Lovelace resource sync failed for microgreens")
 
-        # Expand any base-only resource entries (e.g. "/ha-microgreens/?v=1")
-        try:
-            await _expand_base_resource(self.hass, f"/{LOCAL_SUBDIR}/", [
-                "microgreens-card.js",
-                "microgreens-plot-card.js",
-            ])
-        except Exception:
-            _LOGGER.debug("Failed to expand base resource entries for microgreens")
+        await self.hass.async_add_executor_job(
+            _remove_old_copies, Path(self.hass.config.path("www")) / LOCAL_SUBDIR
+        )
 
         _LOGGER.info(
             "Microgreens: cards served from integration at %s; add these as Lovelace resources if needed (type: module)",
-            card_list_str,
+            ", ".join(f"/{LOCAL_SUBDIR}/{name}?v={ver}" for name, ver in versions.items()),
         )
 
     async def async_unregister(self) -> None:
-        return
-
-
-async def _expand_base_resource(hass: HomeAssistant, base: str, card_names: list[str]) -> int:
-    try:
-        from homeassistant.components.lovelace.resources import ResourceStorageCollection
-    except Exception:
-        _LOGGER.debug("Lovelace helpers unavailable; skipping base resource expansion")
-        return 0
-
-    lovelace = hass.data.get("lovelace")
-    if not lovelace:
-        return 0
-
-    resources: ResourceStorageCollection = (
-        lovelace.resources if hasattr(lovelace, "resources") else lovelace["resources"]
-    )
-
-    await resources.async_get_info()
-
-    created = 0
-
-    targets = [f"{base.rstrip('/')}/{name}?v={_VERSION}" for name in card_names]
-
-    for item in list(resources.async_items()):
-        u = item.get("url", "")
-        if not (u == base or u.startswith(base)):
-            continue
-
-        suffix = u[len(base) :]
-        if suffix and not (suffix.startswith("?") or suffix == ""):
-            continue
+        """Drop our Lovelace resources (current and `/local/` ones); called when the last site is deleted."""
+        assets = self.hass.data.get(_ASSETS, {})
+        try:
+            from homeassistant.components.frontend import remove_extra_js_url
 
-        _LOGGER.info("Expanding base resource %s into %s", u, ",".join(targets))
+            for name, asset in assets.items():
+                remove_extra_js_url(self.hass, f"/{LOCAL_SUBDIR}/{name}?v={asset.version}")
+        except Exception:
+            _LOGGER.debug("Frontend helpers unavailable; no extra JS URLs to remove")
 
-        try:
-            first = targets[0]
-            if isinstance(resources, ResourceStorageCollection):
-                await resources.async_update_item(item["id"], {"res_type": "module", "url": first})
-            else:
-                item["url"] = first
-            created += 1
-
-            existing_urls = {it.get("url", "") for it in resources.async_items()}
-            for t in targets[1:]:
-                if t in existing_urls:
-                    continue
-                if isinstance(resources, ResourceStorageCollection):
-                    await resources.async_create_item({"res_type": "module", "url": t})
-                else:
-                    resources.async_items().append({"url": t})
-                created += 1
-        except Exception as exc:
-            _LOGGER.warning("Failed to expand base resource %s: %s", u, exc)
-
-    return created
+        found = await _async_resources(self.hass)
+        if found is None:
+            return
+        resources, storage_mode = found
+        if not storage_mode:
+            return  # YAML resources are the user's to edit
+        prefixes = (f"/{LOCAL_SUBDIR}/", f"/local/{LOCAL_SUBDIR}/")
+        for item in list(resources.async_items()):
+            if item.get("url", "").split("?", 1)[0].startswith(prefixes):
+                try:
+                    await resources.async_delete_item(item["id"])
+                    _LOGGER.info("Removed Lovelace resource %s", item["url"])
+                except Exception as exc:
+                    _LOGGER.warning("Failed to remove Lovelace resource %s: %s", item.get("url"), exc)
@@ -0,0 +1,106 @@
+"""Harvest history: a lazily read archive plus incrementally kept aggregates.
+
+Completed deployments are appended to `.storage/<store key>.history`
+(JSON lines) and never held in memory. The aggregates live in their own
+small Store and are updated once per harvest, so reading them never scans
+the archive.
+"""
+from __future__ import annotations
+
+from datetime import date
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import storage
+
+from .const import STORAGE_KEY
+from .journal import JsonLinesFile
+
+HISTORY_STATS_VERSION = 1
+
+
+class HarvestHistory:
+    def __init__(self, hass: HomeAssistant, key: str = STORAGE_KEY, save_delay: float = 0):
+        self.hass = hass
+        self.save_delay = save_delay
+        self._stats_store = storage.Store(hass, HISTORY_STATS_VERSION, f"{key}.history_stats")
+        self._archive = JsonLinesFile(hass.config.path(storage.STORAGE_DIR, f"{key}.history"))
+        self._pending: list[dict] = []
+        self._stats_dirty = False
+        self.stats: dict = {"cycles": 0, "profiles": {}, "plots": {}}
+
+    async def async_load(self) -> None:
+        self.stats = await self._stats_store.async_load() or self.stats
+
+    @callback
+    def record(self, dep, harvested_on: date) -> dict:
+        """Archive one completed deployment and fold it into the aggregates."""
+        planned = (dep.harvest_date - dep.start_date).days
+        actual = max(0, (harvested_on - dep.start_date).days)
+        rec = {**dep.to_dict(), "harvested_on": harvested_on.isoformat(), "planned_days": planned, "actual_days": actual}
+        self._pending.append(rec)
+        self._stats_dirty = True
+
+        self.stats["cycles"] += 1
+        prof = self.stats["profiles"].setdefault(
+            dep.plant_id, {"name": dep.plant_name, "cycles": 0, "planned_days": 0, "actual_days": 0}
+        )
+        prof["name"] = dep.plant_name
+        prof["cycles"] += 1
+        prof["planned_days"] += planned
+        prof["actual_days"] += actual
+
+        plot = self.stats["plots"].setdefault(
+            dep.plot_id, {"cycles": 0, "occupied_days": 0, "first_start": rec["start_date"]}
+        )
+        plot["cycles"] += 1
+        plot["occupied_days"] += actual
+        plot["first_start"] = min(plot["first_start"], rec["start_date"])
+        return rec
+
+    async def async_save(self) -> None:
+        """Append pending archive records and persist the aggregates."""
+        if not self._pending:
+            return
+        records, self._pending = self._pending, []
+        await self.hass.async_add_executor_job(self._archive.append, records)
+        if self.save_delay > 0:
+            self._stats_store.async_delay_save(lambda: self.stats, self.save_delay)
+        else:
+            await self._stats_store.async_save(self.stats)
+            self._stats_dirty = False
+
+    async def async_close(self) -> None:
+        """Write everything now (entry unload); replaces any pending delayed stats save."""
+        await self.async_save()
+        if self._stats_dirty:
+            await self._stats_store.async_save(self.stats)
+            self._stats_dirty = False
+
+    async def async_records(self, limit: int = 0, plot_id: str | None = None) -> list[dict]:
+        """Read raw archive records (newest last); this is the only path that loads the archive."""
+        records = await self.hass.async_add_executor_job(self._archive.read)
+        records += self._pending
+        if plot_id:
+            records = [r for r in records if r.get("plot_id") == plot_id]
+        return records[-limit:] if limit else records
+
+    def summary(self, today: date) -> dict:
+        """Aggregates with derived means/utilisation; O(profiles + plots)."""
+        profiles = {
+            pid: {
+                "name": p["name"],
+                "cycles": p["cycles"],
+                "mean_planned_days": round(p["planned_days"] / p["cycles"], 2),
+                "mean_actual_days": round(p["actual_days"] / p["cycles"], 2),
+            }
+            for pid, p in self.stats["profiles"].items() if p["cycles"]
+        }
+        plots = {}
+        for pid, p in self.stats["plots"].items():
+            span = max(1, (today - date.fromisoformat(p["first_start"])).days)
+            plots[pid] = {
+                "cycles": p["cycles"],
+                "occupied_days": p["occupied_days"],
+                "utilisation": round(min(1.0, p["occupied_days"] / span), 3),
+            }
+        return {"cycles": self.stats["cycles"], "profiles": profiles, "plots": plots}
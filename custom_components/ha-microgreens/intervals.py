@@ -0,0 +1,52 @@
+"""Deployment interval index for calendar range queries.
+
+Spans are [start, end) in proleptic day ordinals, kept sorted by start.
+Grow cycles are short, so remembering the longest span lets a query bisect
+straight to the first span that can still overlap (start > lo - longest)
+instead of scanning from the beginning: O(log n + k).
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections.abc import Iterator
+
+
+class IntervalIndex:
+    def __init__(self):
+        self._starts: list[tuple[int, str]] = []  # (start, key), sorted
+        self._spans: dict[str, tuple[int, int]] = {}
+        self._longest = 0  # only grows; a stale bound just widens the bisect window
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def put(self, key: str, start: int, end: int) -> None:
+        old = self._spans.get(key)
+        if old == (start, end):
+            return
+        if old:
+            self._drop(key, old[0])
+        self._spans[key] = (start, end)
+        insort(self._starts, (start, key))
+        self._longest = max(self._longest, end - start)
+
+    def remove(self, key: str) -> None:
+        old = self._spans.pop(key, None)
+        if old:
+            self._drop(key, old[0])
+
+    def _drop(self, key: str, start: int) -> None:
+        i = bisect_left(self._starts, (start, key))
+        if i < len(self._starts) and self._starts[i] == (start, key):
+            del self._starts[i]
+
+    def overlapping(self, lo: int, hi: int) -> Iterator[tuple[str, int, int]]:
+        """Yield (key, start, end) for spans with start < hi and end > lo, by start."""
+        starts = self._starts
+        for i in range(bisect_left(starts, (lo - self._longest, "")), len(starts)):
+            start, key = starts[i]
+            if start >= hi:
+                break
+            end = self._spans[key][1]
+            if end > lo:
+                yield key, start, end
@@ -0,0 +1,79 @@
+"""Append-only JSON-lines files kept next to the .storage snapshot.
+
+The mutation journal is one: each line is {"seq": n, "op": "...",
+"c": collection, "k": key, "v": value-or-null}, where a null value deletes
+the key. The harvest archive (history.py) is another. Every JsonLinesFile
+method does blocking file I/O and must run in the executor.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class JsonLinesFile:
+    def __init__(self, path: str):
+        self.path = path
+
+    def read(self) -> list[dict]:
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                lines = fh.readlines()
+        except FileNotFoundError:
+            return []
+        entries = []
+        for n, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # a torn last line after a crash mid-append; everything before it is intact
+                _LOGGER.warning("Skipping unreadable journal line %d in %s", n, self.path)
+        return entries
+
+    def append(self, entries: list[dict]) -> int:
+        """Append entries, fsync, and return the number of bytes written."""
+        payload = "".join(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n" for e in entries)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        return len(payload)
+
+    def truncate(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def replay(raw: dict, entries: list[dict], after_seq: int) -> int:
+    """Apply journal entries newer than `after_seq` onto a snapshot dict.
+
+    The snapshot keeps its list layout; entries are applied by key, so a
+    replayed put keeps the item's position and a new key is appended.
+    Returns the highest sequence number seen.
+    """
+    seq = after_seq
+    cols = {}
+    for e in entries:
+        if e.get("seq", 0) <= after_seq:
+            continue  # already folded into the snapshot by a compaction
+        seq = max(seq, e["seq"])
+        c = e["c"]
+        if c not in cols:
+            key = "plot_id" if c == "deployments" else "id"
+            cols[c] = {x[key]: x for x in raw.get(c, [])}
+        if e.get("v") is None:
+            cols[c].pop(e["k"], None)
+        else:
+            cols[c][e["k"]] = e["v"]
+    for c, items in cols.items():
+        raw[c] = list(items.values())
+    return seq
@@ -0,0 +1,70 @@
+"""Per-entry registration bookkeeping and setup timing.
+
+Everything a Runtime hooks into Home Assistant (timers, schedulers, bus
+listeners, websocket subscriptions, the store) is recorded here together
+with the callable that undoes it. Unloading the entry closes them all in
+reverse order, so a reload leaves nothing behind that still points at the
+old Runtime.
+"""
+from __future__ import annotations
+
+import inspect
+import logging
+from collections import Counter
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    def __init__(self):
+        self._undo: dict[int, tuple[str, Callable[[], Any]]] = {}  # insertion order = setup order
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    def add(self, kind: str, undo: Callable[[], Any]) -> int:
+        """Track one registration; returns a handle for discard()."""
+        self._next += 1
+        self._undo[self._next] = (kind, undo)
+        return self._next
+
+    def discard(self, handle: int) -> None:
+        """Forget a registration its owner has already undone itself."""
+        self._undo.pop(handle, None)
+
+    def counts(self) -> dict[str, int]:
+        return dict(Counter(kind for kind, _ in self._undo.values()))
+
+    async def async_close(self) -> None:
+        while self._undo:
+            _handle, (kind, undo) = self._undo.popitem()
+            try:
+                result = undo()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:  # keep tearing down the rest
+                _LOGGER.exception("Error undoing %s registration", kind)
+
+
+class PhaseTimer:
+    """Wall-clock milliseconds per named setup phase, in the order they ran."""
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self._start = self._last = perf_counter()
+
+    def mark(self, phase: str) -> None:
+        now = perf_counter()
+        self.phases[phase] = round((now - self._last) * 1000, 2)
+        self._last = now
+
+    @property
+    def total_ms(self) -> float:
+        return round((self._last - self._start) * 1000, 2)
+
+    def __str__(self) -> str:
+        return ", ".join(f"{k} {v:.1f} ms" for k, v in self.phases.items())
@@ -0,0 +1,80 @@
+"""Opt-in hot-path counters and latency histograms.
+
+Enabled per entry by the `debug_metrics` option. When it is off every
+call returns after one attribute check, so the instrumented paths pay
+nothing measurable:
+
+    t0 = metrics.clock()
+    ...work...
+    metrics.timed("store_save", t0, bytes=n)
+
+Latencies are kept as fixed-bucket histograms (milliseconds) plus count,
+sum and max; nothing grows with the number of observations.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any
+
+# upper bounds, ms; the last bucket is everything slower
+BUCKETS_MS: tuple[float, ...] = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+
+class _Histogram:
+    __slots__ = ("count", "sum_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        self.buckets[bisect_left(BUCKETS_MS, ms)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        labels = [f"<={b:g}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]:g}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 3) if self.count else 0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class Metrics:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.counters: dict[str, int] = {}
+        self._latency: dict[str, _Histogram] = {}
+
+    def clock(self) -> float:
+        return perf_counter() if self.enabled else 0.0
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def timed(self, name: str, t0: float, **counts: int) -> None:
+        """Record one `name` run started at clock() `t0`, plus optional `<name>_<key>` counters."""
+        if not self.enabled:
+            return
+        hist = self._latency.get(name)
+        if hist is None:
+            hist = self._latency[name] = _Histogram()
+        hist.add((perf_counter() - t0) * 1000)
+        self.counters[name] = self.counters.get(name, 0) + 1
+        for key, n in counts.items():
+            self.count(f"{name}_{key}", n)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "counters": dict(sorted(self.counters.items())),
+            "latency": {name: h.as_dict() for name, h in sorted(self._latency.items())},
+        }
@@ -0,0 +1,111 @@
+"""Single-writer queue for a Runtime's model.
+
+Service calls hand their change to `submit()` as a plain synchronous
+function instead of mutating the model and awaiting a save themselves. One
+drain task applies everything queued so far, in submission order, and then
+commits the whole burst with a single save/broadcast; changes that arrive
+while that commit is awaited form the next batch. Each caller resumes once
+its own change has been committed, with the function's return value or the
+exception it raised.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class MutationQueue:
+    def __init__(self, hass: HomeAssistant, commit: Callable[[], Awaitable[None]], name: str = "microgreens"):
+        self.hass = hass
+        self._commit = commit
+        self._name = name
+        self._pending: deque[tuple[Callable[[], Any], asyncio.Future]] = deque()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+        # metrics
+        self.max_depth = 0
+        self.batches = 0
+        self.mutations = 0
+        self.last_batch = 0
+        self.max_batch = 0
+
+    @property
+    def depth(self) -> int:
+        """Changes waiting for the next batch."""
+        return len(self._pending)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "batches": self.batches,
+            "mutations": self.mutations,
+            "last_batch": self.last_batch,
+            "max_batch": self.max_batch,
+            "mean_batch": round(self.mutations / self.batches, 2) if self.batches else 0,
+        }
+
+    async def submit(self, fn: Callable[[], T]) -> T:
+        """Queue `fn` (must not await) and return its result once it is committed."""
+        if self._closed:
+            raise RuntimeError(f"{self._name} mutation queue is closed")
+        fut = self.hass.loop.create_future()
+        self._pending.append((fn, fut))
+        self.max_depth = max(self.max_depth, len(self._pending))
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(self._drain(), f"{self._name} mutation queue")
+        return await fut
+
+    async def async_close(self) -> None:
+        """Wait until everything already queued has been committed (entry unload).
+
+        Later submissions are refused: the stores close right after this, and
+        a new batch would re-arm their timers behind the next Runtime's back.
+        """
+        self._closed = True
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def _drain(self) -> None:
+        try:
+            while self._pending:
+                batch = list(self._pending)
+                self._pending.clear()
+                outcomes: list[tuple[asyncio.Future, Any, BaseException | None]] = []
+                for fn, fut in batch:
+                    try:
+                        outcomes.append((fut, fn(), None))
+                    except Exception as err:  # reported to that caller only
+                        outcomes.append((fut, None, err))
+
+                commit_error: BaseException | None = None
+                try:
+                    await self._commit()
+                except Exception as err:
+                    _LOGGER.exception("Committing %d queued changes failed", len(batch))
+                    commit_error = err
+
+                self.batches += 1
+                self.mutations += len(batch)
+                self.last_batch = len(batch)
+                self.max_batch = max(self.max_batch, len(batch))
+                _LOGGER.debug("Committed %d queued changes (%d waiting)", len(batch), len(self._pending))
+
+                for fut, result, err in outcomes:
+                    if fut.done():  # caller went away
+                        continue
+                    if err or commit_error:
+                        fut.set_exception(err or commit_error)
+                    else:
+                        fut.set_result(result)
+        finally:
+            self._task = None
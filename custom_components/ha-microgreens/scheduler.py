@@ -0,0 +1,101 @@
+"""Event-driven per-plot transition scheduler.
+
+Upcoming transitions live in a min-heap and only the earliest one has a
+timer armed (async_track_point_in_time). When it fires, every due entry is
+popped and the affected plots are handed to the callback in one batch.
+Rescheduling a plot bumps its generation; superseded heap entries are
+skipped when popped instead of being searched for and removed.
+"""
+from __future__ import annotations
+
+import heapq
+from collections.abc import Callable, Iterable
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import event as ha_event
+import homeassistant.util.dt as dt_util
+
+
+class TransitionScheduler:
+    def __init__(self, hass: HomeAssistant, on_due: Callable[[set[str]], None]):
+        self.hass = hass
+        self._on_due = on_due
+        self._heap: list[tuple[datetime, int, str]] = []  # (when, generation, key)
+        self._gen: dict[str, int] = {}
+        self._seq = 0
+        self._armed: datetime | None = None
+        self._unsub = None
+        self._running = False
+
+    def __len__(self) -> int:
+        return len(self._gen)
+
+    @callback
+    def async_start(self) -> None:
+        self._running = True
+        self._arm()
+
+    @callback
+    def async_stop(self) -> None:
+        self._running = False
+        self._disarm()
+
+    @callback
+    def schedule(self, key: str, times: Iterable[datetime]) -> None:
+        """Replace every pending transition of `key` with `times`."""
+        self._seq += 1
+        self._gen[key] = gen = self._seq
+        for when in times:
+            heapq.heappush(self._heap, (when, gen, key))
+        self._maybe_compact()
+        self._arm()
+
+    @callback
+    def cancel(self, key: str) -> None:
+        if self._gen.pop(key, None) is not None:
+            self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        # stale entries are normally dropped lazily; rebuild if they dominate
+        if len(self._heap) > 64 and len(self._heap) > 4 * len(self._gen):
+            self._heap = [e for e in self._heap if self._gen.get(e[2]) == e[1]]
+            heapq.heapify(self._heap)
+
+    def _disarm(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        self._armed = None
+
+    def _arm(self) -> None:
+        if not self._running:
+            return
+        while self._heap and self._gen.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._disarm()
+            return
+        when = self._heap[0][0]
+        if self._armed == when:
+            return
+        self._disarm()
+        self._armed = when
+        self._unsub = ha_event.async_track_point_in_time(self.hass, self._fire, when)
+
+    @callback
+    def _fire(self, _now: datetime) -> None:
+        self._unsub = None
+        self._armed = None
+        now = dt_util.utcnow()
+        due: set[str] = set()
+        while self._heap and self._heap[0][0] <= now:
+            _when, gen, key = heapq.heappop(self._heap)
+            if self._gen.get(key) == gen:
+                due.add(key)
+        for key in due:
+            # one-shot: the callback reschedules whatever comes next for the key
+            self._gen.pop(key, None)
+        if due:
+            self._on_due(due)
+        self._arm()
@@ -1,12 +1,16 @@
 from __future__ import annotations
-from datetime import date
-from homeassistant.components.sensor import SensorEntity
+import homeassistant.util.dt as dt_util
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers import entity_registry as er
-from .const import DOMAIN, SIGNAL_DATA_UPDATED, SIGNAL_NEW_PLOT, SIGNAL_REMOVE_PLOT
+from homeassistant.helpers.start import async_at_started
+from .const import (
+    DOMAIN, SIGNAL_NEW_PLOT, SIGNAL_REMOVE_PLOT,
+    SIGNAL_PLOT_UPDATED, SIGNAL_META_UPDATED,
+)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
@@ -17,20 +21,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
     # seed entities
     ents = [MicrogreensMetaSensor(rt)]
-    for p in rt.data.plots:
+    if rt.metrics.enabled:
+        ents.append(MicrogreensDebugSensor(rt))
+    for p in rt.data.plots.values():
         e = MicrogreensPlotSensor(rt, p.id)
         created[p.id] = e
         ents.append(e)
     async_add_entities(ents)
 
-    # handle dynamic add
+    # handle dynamic add (one dispatch per batch of new plots)
     @callback
-    def _on_new_plot(plot_id: str):
-        if plot_id in created:
-            return
-        e = MicrogreensPlotSensor(rt, plot_id)
-        created[plot_id] = e
-        async_add_entities([e])
+    def _on_new_plot(plot_ids: list[str]):
+        new = []
+        for plot_id in plot_ids:
+            if plot_id in created:
+                continue
+            e = MicrogreensPlotSensor(rt, plot_id)
+            created[plot_id] = e
+            new.append(e)
+        if new:
+            async_add_entities(new)
 
     # handle dynamic remove
     @callback
@@ -47,22 +57,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         if ent_id:
             reg.async_remove(ent_id)
 
-    entry.async_on_unload(async_dispatcher_connect(hass, SIGNAL_NEW_PLOT, _on_new_plot))
-    entry.async_on_unload(async_dispatcher_connect(hass, SIGNAL_REMOVE_PLOT, _on_remove_plot))
+    entry.async_on_unload(async_dispatcher_connect(hass, rt.signal(SIGNAL_NEW_PLOT), _on_new_plot))
+    entry.async_on_unload(async_dispatcher_connect(hass, rt.signal(SIGNAL_REMOVE_PLOT), _on_remove_plot))
+
+    # --- one-time cleanup of registry entries for plots that no longer exist;
+    # only this entry's registrations are visited, and not until HA has started
+    @callback
+    def _purge_orphans(_hass: HomeAssistant):
+        reg = er.async_get(hass)
+        prefix = f"{entry.entry_id}_plot_"
+        for ent_entry in er.async_entries_for_config_entry(reg, entry.entry_id):
+            if ent_entry.domain != "sensor" or not ent_entry.unique_id.startswith(prefix):
+                continue
+            if ent_entry.unique_id[len(prefix):] not in rt.data.plots:
+                reg.async_remove(ent_entry.entity_id)
 
-    # --- one-time startup cleanup: purge registry entries for plots that no longer exist
-    reg = er.async_get(hass)
-    existing_plots = {p.id for p in rt.data.plots}
-    # iterate over all registry entries for this integration+platform
-    for ent_entry in list(reg.entities.values()):
-        if ent_entry.domain != "sensor" or ent_entry.platform != DOMAIN:
-            continue
-        # our unique_id format: "<entry_id>_plot_<plot_id>"
-        if not ent_entry.unique_id.startswith(f"{entry.entry_id}_plot_"):
-            continue
-        plot_id = ent_entry.unique_id.split("_plot_", 1)[-1]
-        if plot_id not in existing_plots:
-            reg.async_remove(ent_entry.entity_id)
+    entry.async_on_unload(async_at_started(hass, _purge_orphans))
 
 
 class _Base(SensorEntity):
@@ -70,17 +80,18 @@ class _Base(SensorEntity):
     def device_info(self) -> DeviceInfo:
         return DeviceInfo(
             identifiers={(DOMAIN, self._rt.entry.entry_id)},
-            name="Microgreens Manager",
+            name=self._rt.device_name,
             manufacturer="Custom"
         )
 
 class MicrogreensMetaSensor(_Base):
     _attr_icon = "mdi:database-cog"
-    _attr_unique_id = "microgreens_meta"
-    _attr_name = "Microgreens Meta"
+    _unrecorded_attributes = frozenset({"profiles", "plots"})
 
     def __init__(self, rt):
         self._rt = rt
+        self._attr_unique_id = f"{rt.entry.entry_id}_meta"
+        self._attr_name = f"{rt.entity_prefix} Meta"
 
     @property
     def native_value(self):
@@ -88,64 +99,112 @@ class MicrogreensMetaSensor(_Base):
 
     @property
     def extra_state_attributes(self):
+        meta = self._rt.meta()
         return {
-            "profiles": [{
-                "id": p.id, "name": p.name, "cover_days": p.cover_days,
-                "uncover_days": p.uncover_days, "water": p.watering_frequency_days,
-                "notes": p.notes
-            } for p in self._rt.data.profiles],
-            "plots": [{"id": p.id, "label": p.label} for p in self._rt.data.plots],
+            "revision": meta["revision"],
+            "profile_count": len(meta["profiles"]),
+            "plot_count": len(meta["plots"]),
+            # full lists stay available to templates but are kept out of the
+            # recorder; the cards page through them via microgreens/meta
+            "profiles": meta["profiles"],
+            "plots": meta["plots"],
         }
 
     async def async_added_to_hass(self):
-        self.async_on_remove(async_dispatcher_connect(self.hass, SIGNAL_DATA_UPDATED, self._upd))
+        self.async_on_remove(async_dispatcher_connect(self.hass, self._rt.signal(SIGNAL_META_UPDATED), self._upd))
 
     @callback
     def _upd(self):
+        self._rt.metrics.count("state_writes")
         self.async_write_ha_state()
 
+
+class MicrogreensDebugSensor(_Base):
+    """Committed mutations, with the live counters in the attributes.
+
+    Only created with the debug_metrics option. Refreshed by polling rather
+    than on every change, so watching the counters adds no state writes to
+    the paths being measured.
+    """
+    _attr_icon = "mdi:speedometer"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _unrecorded_attributes = frozenset({"sizes", "queue", "registrations", "setup_ms", "metrics"})
+
+    def __init__(self, rt):
+        self._rt = rt
+        self._attr_unique_id = f"{rt.entry.entry_id}_debug"
+        self._attr_name = f"{rt.entity_prefix} Debug"
+
+    @property
+    def native_value(self):
+        return self._rt.mutations.mutations
+
+    @property
+    def extra_state_attributes(self):
+        return self._rt.debug_info()
+
 class MicrogreensPlotSensor(_Base):
+    """One plot's phase and deployment details.
+
+    State and attributes are computed together into a cached snapshot, which
+    is rebuilt only when the plot is signalled. That happens when its
+    deployment changes, and at the midnight tick the transition scheduler
+    arms for each occupied plot. A rebuild that matches the cached snapshot
+    writes nothing.
+    """
     _attr_icon = "mdi:sprout"
+    _attr_should_poll = False  # pushed by the runtime; polling would only re-write the cache
 
     def __init__(self, rt, plot_id: str):
         self._rt = rt
         self._plot_id = plot_id
         self._attr_unique_id = f"{rt.entry.entry_id}_plot_{plot_id}"
         # IMPORTANT: name controls entity_id → sensor.microgreens_plot_<ID>
-        self._attr_name = f"Microgreens Plot {plot_id}"
+        # (sensor.microgreens_<site>_plot_<ID> for additional sites)
+        self._attr_name = f"{rt.entity_prefix} Plot {plot_id}"
+        self._idle = ("idle", {
+            "plot_id": plot_id, "sticker": "", "plant_id": "", "plant_name": "",
+            "days_since_planting": 0, "cover_end": "", "harvest_date": "", "next_watering_due": "",
+        })
+        self._snap: tuple[str, dict] | None = None
+
+    def _compute(self) -> tuple[str, dict]:
+        dep = self._rt.data.deployments.get(self._plot_id)
+        if not dep:
+            return self._idle
+        today = dt_util.now().date()
+        return dep.phase(today), {
+            "plot_id": dep.plot_id, "sticker": dep.sticker, "plant_id": dep.plant_id, "plant_name": dep.plant_name,
+            "days_since_planting": max(0, (today - dep.start_date).days), "cover_end": dep.cover_end.isoformat(),
+            "harvest_date": dep.harvest_date.isoformat(), "next_watering_due": dep.next_watering_due.isoformat(),
+        }
+
+    @property
+    def _snapshot(self) -> tuple[str, dict]:
+        if self._snap is None:
+            self._snap = self._compute()
+        return self._snap
 
     @property
     def native_value(self):
-        dep = next((d for d in self._rt.data.deployments if d.plot_id == self._plot_id), None)
-        if not dep:
-            return "idle"
-        today = date.today()
-        ce = date.fromisoformat(dep.cover_end)
-        hv = date.fromisoformat(dep.harvest_date)
-        if today < ce:
-            return "covered"
-        if today < hv:
-            return "uncovered"
-        return "mature"
+        return self._snapshot[0]
 
     @property
     def extra_state_attributes(self):
-        dep = next((d for d in self._rt.data.deployments if d.plot_id == self._plot_id), None)
-        if not dep:
-            return {
-                "plot_id": self._plot_id, "sticker": "", "plant_id": "", "plant_name": "",
-                "days_since_planting": 0, "cover_end": "", "harvest_date": "", "next_watering_due": "",
-            }
-        days = max(0, (date.today() - date.fromisoformat(dep.start_date)).days)
-        return {
-            "plot_id": dep.plot_id, "sticker": dep.sticker, "plant_id": dep.plant_id, "plant_name": dep.plant_name,
-            "days_since_planting": days, "cover_end": dep.cover_end, "harvest_date": dep.harvest_date,
-            "next_watering_due": dep.next_watering_due,
-        }
+        return self._snapshot[1]
 
     async def async_added_to_hass(self):
-        self.async_on_remove(async_dispatcher_connect(self.hass, SIGNAL_DATA_UPDATED, self._upd))
+        self.async_on_remove(async_dispatcher_connect(
+            self.hass, self._rt.signal(SIGNAL_PLOT_UPDATED, self._plot_id), self._upd
+        ))
 
     @callback
     def _upd(self):
+        snap = self._compute()
+        if snap == self._snap:
+            self._rt.metrics.count("state_writes_skipped")
+            return
+        self._snap = snap
+        self._rt.metrics.count("state_writes")
         self.async_write_ha_state()
@@ -0,0 +1,115 @@
+"""Websocket commands used by the Lovelace cards.
+
+microgreens/subscribe pushes one snapshot and then only the plots (and,
+when profiles or plots were edited, the meta lists) touched by each
+mutation, so the cards never have to rescan hass.states. microgreens/meta
+is a one-shot read of the profile and plot lists, pageable over plots.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .const import CONF_SITE, DOMAIN, KEY_SITES
+
+
+def _runtime(hass: HomeAssistant, msg: dict[str, Any]):
+    """The runtime named by entry_id or site; the only one if neither is given."""
+    runtimes = hass.data.get(DOMAIN, {})
+    entry_id = msg.get("entry_id")
+    if not entry_id and msg.get(CONF_SITE):
+        entry_id = hass.data.get(KEY_SITES, {}).get(slugify(msg[CONF_SITE]))
+        if entry_id is None:
+            return None
+    if entry_id:
+        return runtimes.get(entry_id)
+    return next(iter(runtimes.values()), None) if len(runtimes) == 1 else None
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "microgreens/meta",
+    vol.Optional("entry_id"): str,
+    vol.Optional(CONF_SITE): str,
+    vol.Optional("offset", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional("limit", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),  # 0 = all plots
+})
+@callback
+def ws_meta(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    rt = _runtime(hass, msg)
+    if rt is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "No such Microgreens site")
+        return
+    meta = rt.meta()
+    plots = meta["plots"]
+    offset, limit = msg["offset"], msg["limit"]
+    connection.send_result(msg["id"], {
+        "revision": meta["revision"],
+        "profiles": meta["profiles"],
+        "plots": plots[offset:offset + limit] if limit else plots[offset:],
+        "plot_count": len(plots),
+        "offset": offset,
+    })
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "microgreens/subscribe",
+    vol.Optional("entry_id"): str,
+    vol.Optional(CONF_SITE): str,
+    # only these plots (and no meta); single-plot cards need nothing else
+    vol.Optional("plot_id"): vol.Any(str, [str]),
+})
+@callback
+def ws_subscribe(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    rt = _runtime(hass, msg)
+    if rt is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "No such Microgreens site")
+        return
+
+    @callback
+    def forward(delta: dict) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], delta))
+
+    only = msg.get("plot_id")
+    if only is None:
+        unsub = rt.async_subscribe_deltas(forward)
+        snapshot = rt.snapshot()
+    else:
+        only = {only} if isinstance(only, str) else set(only)
+
+        @callback
+        def forward_filtered(delta: dict) -> None:
+            plots = {pid: view for pid, view in delta["plots"].items() if pid in only}
+            if plots:
+                forward({"plots": plots})
+
+        unsub = rt.async_subscribe_deltas(forward_filtered)
+        snapshot = {"plots": {pid: rt.plot_view(pid) for pid in only}}
+
+    @callback
+    def close() -> None:
+        # the entry is unloading: end the feed so the card resubscribes to the new runtime
+        unsub()
+        connection.subscriptions.pop(msg["id"], None)
+        forward({"closed": True})
+
+    handle = rt.lifecycle.add("websocket", close)
+
+    @callback
+    def unsubscribe() -> None:
+        unsub()
+        rt.lifecycle.discard(handle)
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
+    forward({"snapshot": True, **snapshot})
+
+
+@callback
+def async_register(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, ws_meta)
+    websocket_api.async_register_command(hass, ws_subscribe)
@@ -1,14 +1,82 @@
 window.customCards = window.customCards || [];
 window.customCards.push({ type: "microgreens-card", name: "Microgreens Card", description: "Manage microgreens" });
 
+// windowed grid: "auto" switches it on above this many (filtered) plots
+const VIRTUAL_AUTO_MIN = 200;
+const VIRTUAL_OVERSCAN = 2;  // extra rows rendered above and below the viewport
+
 class MicrogreensCard extends HTMLElement {
   setConfig(c){ this._config=c||{}; }
   getCardSize(){ return 4; }
   set hass(h){
     this._hass = h;
     if (!this._root) this._render();
+    this._subscribe();
+    // with a live subscription, unrelated state changes don't touch the DOM
+    if (this._live) return;
     this._update();
+    this._refreshOpenPlotsModal();
+  }
+
+  connectedCallback(){ if (this._hass) this._subscribe(); }
+  disconnectedCallback(){
+    clearTimeout(this._retry);
+    if (this._raf) { cancelAnimationFrame(this._raf); this._raf = null; }
+    if (this._unsub) { this._unsub.then(u=>u()).catch(()=>{}); this._unsub = null; }
+    this._live = false;
+  }
+
+  // microgreens/subscribe: one snapshot, then only changed plots (+ meta when
+  // profiles/plots were edited). Older backends without the command fall back
+  // to reading hass.states on every update.
+  _subscribe(){
+    if (this._unsub || this._wsUnsupported || !this._hass.connection) return;
+    this._unsub = this._hass.connection.subscribeMessage(m=>this._onDelta(m), {type:"microgreens/subscribe", ...(this._site() ? {site:this._site()} : {})});
+    this._unsub.catch((err)=>{
+      this._unsub = null; this._live = false;
+      // not_found: the site is (re)loading, try again; anything else: old backend
+      if (err && err.code === "not_found") this._resubscribeLater();
+      else this._wsUnsupported = true;
+      this._update();
+    });
+  }
+  _resubscribeLater(){
+    clearTimeout(this._retry);
+    this._retry = setTimeout(()=>{ if (this.isConnected && this._hass) this._subscribe(); }, 2000);
+  }
+  _onDelta(m){
+    if (m.closed) {
+      // the integration reloaded; the server already dropped this subscription
+      const u=this._unsub; this._unsub=null; this._live=false;
+      if (u) u.then(f=>f()).catch(()=>{});
+      this._resubscribeLater();
+      return;
+    }
+    if (m.snapshot) {
+      this._live = true;
+      this._metaCache = m.meta;
+      this._views = m.plots;
+      this._update();
+      this._refreshOpenPlotsModal();
+      return;
+    }
+    this._views = this._views || {};
+    for (const [id, v] of Object.entries(m.plots || {})) {
+      if (v) this._views[id] = v; else delete this._views[id];
+    }
+    if (m.meta) {
+      // plot list or profiles changed: rebuild the grid and any open editor
+      this._metaCache = m.meta;
+      this._update();
+      this._refreshOpenPlotsModal();
+      return;
+    }
+    // a changed plot may enter or leave the filtered/windowed set
+    if (this._filtering() || this._isVirtual) { this._update(); return; }
+    Object.keys(m.plots || {}).forEach(id=>this._updateTile(id));
+  }
 
+  _refreshOpenPlotsModal(){
     if (this._isOpen("dlgPlots")) {
       const sel = this._root.getElementById("pl_select");
       const inNew = this._isPlotsNew() || (sel && !sel.value);
@@ -38,6 +106,14 @@ class MicrogreensCard extends HTMLElement {
       .grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(320px,1fr));gap:12px}
       .tile{padding:12px;border:1px solid var(--divider-color);border-radius:12px}
 
+      /* filters + windowed grid (only visible rows are in the DOM) */
+      .filters{display:flex;gap:10px;margin:0 0 8px 0;flex-wrap:wrap}
+      .filters input{flex:1}
+      .viewport.virtual{overflow-y:auto;position:relative}
+      .viewport.virtual .sizer{position:relative}
+      .viewport.virtual .grid{position:absolute;left:0;right:0;top:0}
+      .viewport.virtual .tile{box-sizing:border-box;overflow:hidden}
+
       /* tile header */
       .hdr{display:flex;justify-content:space-between;align-items:center;margin-bottom:6px}
       .left{display:flex;gap:10px;align-items:baseline}
@@ -115,7 +191,20 @@ class MicrogreensCard extends HTMLElement {
           <button id="btnProfiles" class="secondary">Profiles</button>
           <button id="btnPlots" class="secondary">Plots</button>
         </div>
-        <div id="grid" class="grid"></div>
+        <div class="filters">
+          <input id="f_search" type="text" placeholder="Search plots">
+          <select id="f_state">
+            <option value="">All states</option>
+            <option value="idle">Idle</option>
+            <option value="covered">Covered</option>
+            <option value="uncovered">Uncovered</option>
+            <option value="mature">Mature</option>
+          </select>
+          <select id="f_profile"><option value="">All profiles</option></select>
+        </div>
+        <div id="viewport" class="viewport">
+          <div id="sizer" class="sizer"><div id="grid" class="grid"></div></div>
+        </div>
       </div>
 
       <!-- Deploy dialog -->
@@ -154,7 +243,10 @@ class MicrogreensCard extends HTMLElement {
             <label>Name *</label>
             <input id="p_name" type="text" placeholder="Rukola">
           </div>
-          <!-- (column 3 row1 intentionally empty to keep columns aligned) -->
+          <div class="field col3 row1">
+            <label>Watering time</label>
+            <input id="p_watering_time" type="time" title="Empty = integration default">
+          </div>
 
           <!-- Row 2 -->
           <div class="field col1 row2">
@@ -222,6 +314,29 @@ class MicrogreensCard extends HTMLElement {
 
     // buttons
     r.getElementById("btnDeploy").onclick=()=>this._openDeploy();
+
+    // filters work on the in-memory plot list; the grid is then re-windowed
+    this._filter = {q:"", state:"", profile:""};
+    const onFilter = ()=>{
+      this._filter = {
+        q: r.getElementById("f_search").value.trim().toLowerCase(),
+        state: r.getElementById("f_state").value,
+        profile: r.getElementById("f_profile").value,
+      };
+      const vp = r.getElementById("viewport");
+      vp.scrollTop = 0;
+      this._update();
+    };
+    r.getElementById("f_search").addEventListener("input", onFilter);
+    r.getElementById("f_state").onchange = onFilter;
+    r.getElementById("f_profile").onchange = onFilter;
+
+    const vp = r.getElementById("viewport");
+    vp.addEventListener("scroll", ()=>this._scheduleWindow(), {passive:true});
+    if (window.ResizeObserver) {
+      this._ro = new ResizeObserver(()=>this._scheduleWindow());
+      this._ro.observe(vp);
+    }
     r.getElementById("btnProfiles").onclick=()=>this._openProfiles();
     r.getElementById("btnPlots").onclick=()=>this._openPlots();
 
@@ -237,7 +352,7 @@ class MicrogreensCard extends HTMLElement {
     r.getElementById("p_select").onchange=()=>this._profileLoadFromSelect();
 
     // live validation + enter-to-save (keep as you had)
-    ["p_id","p_name","p_cover","p_uncover","p_water","p_notes"].forEach(k=>{
+    ["p_id","p_name","p_cover","p_uncover","p_water","p_notes","p_watering_time"].forEach(k=>{
       const el = r.getElementById(k);
       el.addEventListener("input", ()=>this._profileValidate());
       el.addEventListener("keydown", (ev)=>{
@@ -266,56 +381,199 @@ class MicrogreensCard extends HTMLElement {
   }
 
   _meta(){
-    const e=this._hass.states["sensor.microgreens_meta"];
-    const a=e?e.attributes:{};
+    let a = this._live && this._metaCache;
+    if (!a) {
+      const e=this._hass.states[`${this._prefix()}_meta`];
+      a=e?e.attributes:{};
+    }
     return {plots:a.plots||[], profiles:(a.profiles||[]).map(p=>({notes:"", ...p}))};
   }
-  _eid(id){ return `sensor.microgreens_plot_${String(id).toLowerCase()}`; }
+  // `site` (optional) picks one of several Microgreens sites; entity ids
+  // follow the site name except for the default "Microgreens" site
+  _site(){ return (this._config||{}).site || ""; }
+  _prefix(){
+    const s=this._site().toLowerCase().replace(/[^a-z0-9]+/g,"_").replace(/^_+|_+$/g,"");
+    return s && s !== "microgreens" ? `sensor.microgreens_${s}` : "sensor.microgreens";
+  }
+  _eid(id){ return `${this._prefix()}_plot_${String(id).toLowerCase()}`; }
+  _call(service, data){
+    const site=this._site();
+    return this._hass.callService("microgreens", service, site ? {...data, site} : data);
+  }
+
+  // {state, ...attributes} for a plot, from the subscription or hass.states
+  _plot(id){
+    if (this._live) return (this._views && this._views[id]) || {state:"idle"};
+    const s=this._hass.states[this._eid(id)];
+    return s ? {...s.attributes, state:s.state} : {state:"idle"};
+  }
 
+  // Tiles are built once per plot id and then patched in place. A tile is
+  // only touched when its change key moves: the plot's view object when the
+  // subscription is live (views are replaced, never mutated), otherwise the
+  // plot sensor's last_updated.
   _update(){
-    const {plots}=this._meta();
+    const meta=this._meta();
+    this._syncProfileFilter(meta.profiles);
+    const plots=this._filtered(meta.plots);
+    const vp=this._root.getElementById("viewport");
+    const mode=(this._config||{}).virtualize ?? "auto";
+    this._isVirtual = mode === true || (mode === "auto" && plots.length > VIRTUAL_AUTO_MIN);
+    vp.classList.toggle("virtual", this._isVirtual);
+    if (!this._isVirtual) {
+      vp.style.height = "";
+      this._root.getElementById("sizer").style.height = "";
+      const g=this._root.getElementById("grid");
+      g.style.transform = ""; g.style.gridTemplateColumns = "";
+      this._reconcile(plots);
+      return;
+    }
+    this._plotsInView = plots;
+    this._renderWindow();
+  }
+
+  // ---- windowing: rows of fixed height, columns derived from the viewport width
+  _scheduleWindow(){
+    if (!this._isVirtual || this._raf) return;
+    this._raf = requestAnimationFrame(()=>{ this._raf = null; this._renderWindow(); });
+  }
+  _renderWindow(){
+    const cfg=this._config||{};
+    const vp=this._root.getElementById("viewport");
     const g=this._root.getElementById("grid");
-    g.innerHTML="";
+    const plots=this._plotsInView||[];
+    const gap=12, tileH=cfg.tile_height || 112, rowH=tileH + gap;
+    vp.style.height = `${cfg.height || 600}px`;
+    const width = vp.clientWidth || 320;
+    const cols = Math.max(1, Math.floor((width + gap) / (320 + gap)));
+    const rows = Math.ceil(plots.length / cols);
+    const viewH = vp.clientHeight || cfg.height || 600;
+    const first = Math.max(0, Math.floor(vp.scrollTop / rowH) - VIRTUAL_OVERSCAN);
+    const last = Math.min(rows, Math.ceil((vp.scrollTop + viewH) / rowH) + VIRTUAL_OVERSCAN);
+    this._root.getElementById("sizer").style.height = `${Math.max(0, rows * rowH - gap)}px`;
+    g.style.gridTemplateColumns = `repeat(${cols}, minmax(0, 1fr))`;
+    g.style.gridAutoRows = `${tileH}px`;
+    g.style.transform = `translateY(${first * rowH}px)`;
+    this._reconcile(plots.slice(first * cols, last * cols));
+  }
+
+  // ---- filtering on the model, never on the DOM
+  _filtering(){
+    const f=this._filter||{};
+    return !!(f.q || f.state || f.profile);
+  }
+  _filtered(plots){
+    if (!this._filtering()) return plots;
+    const {q, state, profile}=this._filter;
+    return plots.filter(p=>{
+      const a=this._plot(p.id);
+      if (state && a.state !== state) return false;
+      if (profile && a.plant_id !== profile) return false;
+      if (q) {
+        const hay=`${p.id} ${p.label} ${a.plant_name||""} ${a.sticker||""}`.toLowerCase();
+        if (!hay.includes(q)) return false;
+      }
+      return true;
+    });
+  }
+  _syncProfileFilter(profiles){
+    const key=profiles.map(p=>`${p.id}:${p.name}`).join("|");
+    if (key === this._profileFilterKey) return;
+    this._profileFilterKey = key;
+    const sel=this._root.getElementById("f_profile");
+    const cur=sel.value;
+    sel.innerHTML = `<option value="">All profiles</option>`;
+    profiles.forEach(p=>{ const o=document.createElement("option"); o.value=p.id; o.textContent=p.name; sel.appendChild(o); });
+    sel.value = profiles.some(p=>p.id===cur) ? cur : "";
+  }
+
+  // Bring the grid's children in line with `plots`, reusing tiles by id;
+  // tiles that fall out (filtered away or scrolled off) are dropped.
+  _reconcile(plots){
+    const g=this._root.getElementById("grid");
+    const tiles=this._tiles || (this._tiles=new Map());
+    const seen=new Set();
+    let prev=null;
     plots.forEach(p=>{
-      const s=this._hass.states[this._eid(p.id)];
-      const st=s? s.state : "idle";
-      const a=s? s.attributes : {};
-      const div=document.createElement("div");
-      div.className="tile";
-      div.innerHTML = `
-        <div class="hdr">
-          <div class="left">
-            <div class="title">${p.label}</div>
-            <div class="state ${st}">${st}</div>
-          </div>
-          <div class="muted">${a.plant_name || ""}</div>
+      seen.add(p.id);
+      let t=tiles.get(p.id);
+      if (!t) { t=this._makeTile(p.id); tiles.set(p.id, t); }
+      this._patchTile(t, p);
+      // keep DOM order in step with the plot list without re-appending every tile
+      const at = prev ? prev.el.nextSibling : g.firstChild;
+      if (at !== t.el) g.insertBefore(t.el, at);
+      prev=t;
+    });
+    for (const [id, t] of tiles) {
+      if (!seen.has(id)) { t.el.remove(); tiles.delete(id); }
+    }
+  }
+
+  _updateTile(id){
+    const t = this._tiles && this._tiles.get(id);
+    const v = this._views && this._views[id];
+    if (t && v) this._patchTile(t, v);
+  }
+
+  _makeTile(id){
+    const el=document.createElement("div");
+    el.className="tile";
+    el.innerHTML = `
+      <div class="hdr">
+        <div class="left">
+          <div class="title"></div>
+          <div class="state idle">idle</div>
         </div>
+        <div class="muted plant"></div>
+      </div>
 
-        <div class="meta-row-right">
-          <div class="meta-left">
-            <div class="line muted">${a.cover_end ? `Uncover: ${a.cover_end}` : `Uncover: —`}</div>
-            <div class="line muted">${a.harvest_date ? `Harvest: ${a.harvest_date}` : `Harvest: —`}</div>
-          </div>
-          <div class="meta-right">
-            <button class="secondary" data-label="Clear" data-act="clear" data-plot="${p.id}" ${st==='idle'?'disabled':''}>
-              Clear
-            </button>
-          </div>
+      <div class="meta-row-right">
+        <div class="meta-left">
+          <div class="line muted uncover">Uncover: —</div>
+          <div class="line muted harvest">Harvest: —</div>
+        </div>
+        <div class="meta-right">
+          <button class="secondary" data-label="Clear" data-act="clear" disabled>Clear</button>
         </div>
-      `;
-      div.querySelectorAll("button").forEach(b => b.onclick = (ev) => this._tileAction(b.dataset, ev.currentTarget));
-      g.appendChild(div);
+      </div>
+    `;
+    const q = sel => el.querySelector(sel);
+    const t = {
+      el, key: Symbol("new"),
+      title: q(".title"), state: q(".state"), plant: q(".plant"),
+      uncover: q(".uncover"), harvest: q(".harvest"), clear: q("button"),
+    };
+    t.clear.dataset.plot = id;
+    t.clear.onclick = (ev) => this._tileAction(t.clear.dataset, ev.currentTarget);
+    return t;
+  }
 
-    });
+  _tileKey(p){
+    if (this._live) return this._views && this._views[p.id];
+    const s=this._hass.states[this._eid(p.id)];
+    return `${p.label}|${s ? s.last_updated : ""}`;
+  }
+
+  _patchTile(t, p){
+    const key=this._tileKey(p);
+    if (key === t.key) return;
+    t.key=key;
+    const a=this._plot(p.id);
+    const st=a.state;
+    const set=(el, v)=>{ if (el.textContent !== v) el.textContent = v; };
+    set(t.title, p.label);
+    set(t.state, st);
+    t.state.className = `state ${st}`;
+    set(t.plant, a.plant_name || "");
+    set(t.uncover, `Uncover: ${a.cover_end || "—"}`);
+    set(t.harvest, `Harvest: ${a.harvest_date || "—"}`);
+    t.clear.disabled = st === "idle";
   }
 
   // ---- Deploy modal
   _openDeploy(){
     const m=this._meta();
-    const idle = m.plots.filter(p=>{
-      const s=this._hass.states[this._eid(p.id)];
-      return !s || s.state === "idle";
-    });
+    const idle = m.plots.filter(p=>this._plot(p.id).state === "idle");
     const sync=(id,arr,v,t)=>{const el=this._root.getElementById(id); el.innerHTML=""; arr.forEach(i=>{const o=document.createElement("option");o.value=i[v];o.textContent=i[t]; el.appendChild(o)});};
     sync("d_plot", idle, "id","label");
     sync("d_profile", m.profiles, "id","name");
@@ -329,11 +587,10 @@ class MicrogreensCard extends HTMLElement {
     const profile=this._root.getElementById("d_profile").value;
     const start=this._root.getElementById("d_start").value;
     if(!plot||!profile||!start) return;
-    const s=this._hass.states[this._eid(plot)];
-    if (s && s.state !== "idle") { alert(`Plot ${plot} is occupied.`); return; }
+    if (this._plot(plot).state !== "idle") { alert(`Plot ${plot} is occupied.`); return; }
 
     const okBtn = this._root.getElementById("d_ok");
-    await this._hass.callService("microgreens","deploy",{plot_id:plot,profile_id:profile,start_date:start});
+    await this._call("deploy", {plot_id:plot,profile_id:profile,start_date:start});
     this._flashOK(okBtn);
     setTimeout(()=>{ this._root.getElementById("dlgDeploy").close(); }, 550);
   }
@@ -349,7 +606,7 @@ class MicrogreensCard extends HTMLElement {
 
 
   _profileClear(){
-    ["p_id","p_name","p_cover","p_uncover","p_water","p_notes"].forEach(k=>this._root.getElementById(k).value="");
+    ["p_id","p_name","p_cover","p_uncover","p_water","p_notes","p_watering_time"].forEach(k=>this._root.getElementById(k).value="");
     this._root.getElementById("p_id").focus();
     this._profileValidate();
   }
@@ -364,6 +621,7 @@ class MicrogreensCard extends HTMLElement {
     if (p.uncover_days !== undefined) this._root.getElementById("p_uncover").value=p.uncover_days;
     if (p.water !== undefined) this._root.getElementById("p_water").value=p.water;
     if (p.notes !== undefined) this._root.getElementById("p_notes").value=p.notes;
+    this._root.getElementById("p_watering_time").value=p.watering_time||"";
     this._profileValidate();
   }
   _refreshProfilesSelect(keepId){
@@ -387,12 +645,13 @@ class MicrogreensCard extends HTMLElement {
     const name=this._root.getElementById("p_name").value.trim();
     if(!id||!name) return;
     const btn = this._root.getElementById("p_save");
-    await this._hass.callService("microgreens","profile_upsert",{
+    await this._call("profile_upsert", {
       id, name,
       cover_days:Number(this._root.getElementById("p_cover").value||0),
       uncover_days:Number(this._root.getElementById("p_uncover").value||0),
       watering_frequency_days:Number(this._root.getElementById("p_water").value||1),
-      notes:this._root.getElementById("p_notes").value||""
+      notes:this._root.getElementById("p_notes").value||"",
+      watering_time:this._root.getElementById("p_watering_time").value||""
     });
     this._flashOK(btn);
     this._refreshProfilesSelect(id);
@@ -405,7 +664,7 @@ class MicrogreensCard extends HTMLElement {
     const id=this._root.getElementById("p_select").value;
     if(!id) return;
     if(!confirm(`Delete profile ${id}?`)) return;
-    await this._hass.callService("microgreens","profile_delete",{id});
+    await this._call("profile_delete", {id});
     this._profileClear();
   }
   _profileValidate(){
@@ -472,8 +731,8 @@ class MicrogreensCard extends HTMLElement {
     if (!id || !label) return;
 
     const exists = (this._meta().plots||[]).some(x=>x.id===id);
-    if (exists) await this._hass.callService("microgreens","plot_rename",{plot_id:id,label});
-    else        await this._hass.callService("microgreens","plot_add",{plot_id:id,label});
+    if (exists) await this._call("plot_rename", {plot_id:id,label});
+    else        await this._call("plot_add", {plot_id:id,label});
 
     this._flashOK(btn);
     this._setPlotsNew(false);              // leave new mode
@@ -486,7 +745,7 @@ class MicrogreensCard extends HTMLElement {
     if (!id) return;
     if (!confirm(`Delete plot ${id}?`)) return;
 
-    await this._hass.callService("microgreens","plot_remove",{plot_id:id});
+    await this._call("plot_remove", {plot_id:id});
     this._flashOK(btn);
     this._setPlotsNew(false);              // ensure we exit new mode after delete
     this._refreshPlotsModal();
@@ -564,7 +823,7 @@ class MicrogreensCard extends HTMLElement {
   async _tileAction(d, el){
     if (d.act === "clear") {
       if (!confirm(`Clear plot ${d.plot}? This removes its deployment.`)) return;
-      await this._hass.callService("microgreens","unassign",{plot_id:d.plot});
+      await this._call("unassign", {plot_id:d.plot});
       this._flashOK(el);
     }
   }
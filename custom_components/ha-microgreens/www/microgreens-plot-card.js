@@ -16,10 +16,69 @@ class MicrogreensPlotCard extends HTMLElement {
   set hass(h) {
     this._hass = h;
     if (!this._root) this._render();
+    this._subscribe();
+    if (!this._live) this._update();
+  }
+
+  connectedCallback(){ if (this._hass) this._subscribe(); }
+  disconnectedCallback(){
+    clearTimeout(this._retry);
+    if (this._unsub) { this._unsub.then(u => u()).catch(() => {}); this._unsub = null; }
+    this._live = false;
+  }
+
+  // Same microgreens/subscribe feed as the main card, filtered on the server
+  // to this plot. Falls back to hass.states on older backends.
+  _subscribe(){
+    if (this._unsub || this._wsUnsupported || !this._hass.connection) return;
+    this._unsub = this._hass.connection.subscribeMessage(m => this._onDelta(m), {
+      type: "microgreens/subscribe", plot_id: String(this._cfg.plot_id),
+      ...(this._site() ? {site: this._site()} : {}),
+    });
+    this._unsub.catch((err) => {
+      this._unsub = null; this._live = false;
+      if (err && err.code === "not_found") this._resubscribeLater();
+      else this._wsUnsupported = true;
+      this._update();
+    });
+  }
+  _resubscribeLater(){
+    clearTimeout(this._retry);
+    this._retry = setTimeout(() => { if (this.isConnected && this._hass) this._subscribe(); }, 2000);
+  }
+  _onDelta(m){
+    if (m.closed) {
+      const u = this._unsub; this._unsub = null; this._live = false;
+      if (u) u.then(f => f()).catch(() => {});
+      this._resubscribeLater();
+      return;
+    }
+    const id = this._cfg.plot_id;
+    const plots = m.plots || {};
+    if (!m.snapshot && !(id in plots)) return;
+    this._live = true;
+    this._view = plots[id] || null;
     this._update();
   }
 
-  _eid(id){ return `sensor.microgreens_plot_${String(id).toLowerCase()}`; }
+  // `site` (optional) picks one of several Microgreens sites, as in microgreens-card
+  _site(){ return this._cfg.site || ""; }
+  _eid(id){
+    const s = this._site().toLowerCase().replace(/[^a-z0-9]+/g, "_").replace(/^_+|_+$/g, "");
+    const prefix = s && s !== "microgreens" ? `sensor.microgreens_${s}` : "sensor.microgreens";
+    return `${prefix}_plot_${String(id).toLowerCase()}`;
+  }
+  _call(service, data){
+    const site = this._site();
+    return this._hass.callService("microgreens", service, site ? {...data, site} : data);
+  }
+
+  // {state, ...attributes} for this plot, from the subscription or hass.states
+  _plot(){
+    if (this._live) return this._view || {state: "idle"};
+    const e = this._hass.states[this._eid(this._cfg.plot_id)];
+    return e ? {...e.attributes, state: e.state} : {state: "idle"};
+  }
 
   _render() {
     const r = (this._root = this.attachShadow({mode:"open"}));
@@ -80,10 +139,9 @@ class MicrogreensPlotCard extends HTMLElement {
     r.getElementById("clear").onclick = async () => {
       const pid = this._cfg.plot_id;
       if (!pid) return;
-      const s = this._hass.states[this._eid(pid)];
-      if (!s || s.state === "idle") return; // nothing to clear
+      if (this._plot().state === "idle") return; // nothing to clear
       if (!confirm(`Clear plot ${pid}?`)) return;
-      await this._hass.callService("microgreens","unassign",{plot_id: pid});
+      await this._call("unassign", {plot_id: pid});
       this._flashOK(r.getElementById("clear"));
     };
   }
@@ -98,7 +156,7 @@ class MicrogreensPlotCard extends HTMLElement {
 
   _update() {
     const id = this._cfg.plot_id;
-    const e = this._hass.states[this._eid(id)];
+    const a = this._plot();
     const t = this._root.getElementById("t");
     const st = this._root.getElementById("state");
     const plant = this._root.getElementById("plant");
@@ -108,11 +166,10 @@ class MicrogreensPlotCard extends HTMLElement {
     const title = this._cfg.title || `Plot ${id}`;
     t.textContent = title;
 
-    const state = e ? e.state : "idle";
+    const state = a.state;
     st.className = `state ${state}`;
     st.textContent = state;
 
-    const a = e ? e.attributes : {};
     plant.textContent = a.plant_name || "";
 
     un.textContent = `Uncover: ${a.cover_end || "—"}`;